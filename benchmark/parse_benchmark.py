@@ -0,0 +1,99 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import argparse
+from typing import List, Callable
+from bs4 import BeautifulSoup
+from malscraper.Cache import Cache
+from malscraper.AnimePageParser import AnimePageParser
+
+
+def legacy_extract(soup: BeautifulSoup):
+    """
+    The field extraction used before the single-pass parser,
+    which serializes the entire page for the status and episode count
+    :param soup: The parsed page
+    :return: None
+    """
+    soup.select("h1")[0].text
+    for media_type in ["anime", "manga"]:
+        try:
+            table = soup.select(".anime_detail_related_anime")[0]
+            for entry in table.select("a"):
+                entry["href"].startswith("/" + media_type + "/")
+        except IndexError:
+            pass
+    str(soup).split("Status:</span>")[1].split("</div>")[0].strip()
+    str(soup).split("Episodes:</span>")[1].split("</div>")[0].strip()
+
+
+def measure(pages: List[str], parser: str, extract: Callable) -> float:
+    """
+    Measures the average time it takes to parse a page and extract its fields
+    :param pages: The HTML pages to parse
+    :param parser: The BeautifulSoup parser backend to use
+    :param extract: The extraction function to use
+    :return: The average time per page in milliseconds
+    """
+    start = time.perf_counter()
+    for page in pages:
+        extract(BeautifulSoup(page, parser))
+    return (time.perf_counter() - start) * 1000 / len(pages)
+
+
+def main():
+    """
+    Compares the per-page parse time of the legacy and the single-pass
+    field extraction for every available parser backend
+    :return: None
+    """
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("directory", nargs="?",
+                            help="A directory containing anime pages. "
+                                 "Defaults to the pages in the disk cache")
+    arg_parser.add_argument("--limit", type=int, default=100,
+                            help="The maximum amount of pages to parse")
+    args = arg_parser.parse_args()
+
+    pages = []
+    if args.directory is None:
+        Cache()
+        for key in sorted(Cache.store.keys("anime"))[:args.limit]:
+            pages.append(Cache.store.read("anime", key))
+    else:
+        for name in sorted(os.listdir(args.directory))[:args.limit]:
+            with open(os.path.join(args.directory, name), "r") as f:
+                pages.append(f.read())
+
+    for parser in ["html.parser", "lxml"]:
+        try:
+            BeautifulSoup("", parser)
+        except Exception:  # Parser backend not installed
+            continue
+        for label, extract in [("legacy", legacy_extract),
+                               ("single-pass", AnimePageParser.parse)]:
+            print("{:<12} {:<12} {:8.2f} ms/page".format(
+                parser, label, measure(pages, parser, extract)
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+from typing import Callable, Dict, List
+from bs4 import BeautifulSoup
+from stub_server import StubServer
+
+
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+"""
+The root directory of the repository, from which malscraper is imported
+instead of an installed copy. Also used by the other benchmark scripts
+"""
+sys.path.insert(0, root)
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """
+    Summarizes the durations of the operations of a benchmark
+    :param durations: The durations in seconds
+    :return: The amount of operations and timing statistics in milliseconds
+    """
+    durations = sorted(durations)
+    return {
+        "ops": len(durations),
+        "total_ms": sum(durations) * 1000,
+        "mean_ms": statistics.mean(durations) * 1000,
+        "median_ms": statistics.median(durations) * 1000,
+        "p95_ms": durations[int(0.95 * (len(durations) - 1))] * 1000
+    }
+
+
+def measure(function: Callable, arguments: List) -> Dict[str, float]:
+    """
+    Measures the duration of calling a function with each argument
+    :param function: The function to measure
+    :param arguments: The arguments
+    :return: The summarized durations
+    """
+    durations = []
+    for argument in arguments:
+        start = time.perf_counter()
+        function(argument)
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def run(args: argparse.Namespace, cache_root: str) \
+        -> Dict[str, Dict[str, float]]:
+    """
+    Runs the benchmarks against a local stub server
+    :param args: The command line arguments
+    :param cache_root: The temporary directory used for the disk cache
+    :return: The results of the benchmarks
+    """
+    from malscraper.Cache import Cache
+    from malscraper.MalAnime import MalAnime
+    from malscraper.RateLimiter import RateLimiter
+    from malscraper.Transport import SessionTransport
+    from malscraper.UserAnimeList import UserAnimeList
+    from malscraper.UserMalAnime import UserMalAnime
+    from malscraper.AnimePageParser import AnimePageParser
+    from malscraper.types.MediaType import MediaType
+
+    from startup_benchmark import run as run_startup
+
+    server = StubServer(latency=args.latency)
+    Cache.configure(root=cache_root, backend=args.backend)
+    Cache.set_transport(SessionTransport(), server.start())
+    Cache.rate_limiter = RateLimiter(rate=10 ** 9, burst=10 ** 9)
+    results = run_startup(args.repeat)
+
+    def clear(*namespaces: str):
+        for namespace in namespaces:
+            Cache.in_memory[namespace].clear()
+
+    ids = list(range(1, args.pages + 1))
+    load_page = (lambda x: Cache().load_mal_page(x, MediaType.ANIME))
+    load_anime = (lambda x: MalAnime(x, lazy=False))
+
+    results["cache_cold_fetch"] = measure(load_page, ids)
+    clear("anime")
+    results["cache_disk_hit"] = measure(load_page, ids)
+    results["cache_memory_hit"] = measure(load_page, ids)
+
+    clear("anime", "anime_records")
+    results["mal_anime_extract_record"] = measure(load_anime, ids)
+    clear("anime", "anime_records")
+    results["mal_anime_disk_record"] = measure(load_anime, ids)
+    results["mal_anime_memory_record"] = measure(load_anime, ids)
+
+    def parse_many(workers: int):
+        clear("anime", "anime_records")
+        for mal_id in ids:
+            Cache.store.delete("anime_records", mal_id)
+        MalAnime.parse_many(ids, workers)
+
+    results["mal_anime_parse_many_serial"] = measure(parse_many, [1])
+    results["mal_anime_parse_many"] = measure(parse_many, [args.workers])
+
+    clear("anime", "anime_records")
+    for mal_id in ids:
+        Cache.store.delete("anime_records", mal_id)
+    Cache.strain_pages = True
+    results["mal_anime_extract_record_strained"] = measure(load_anime, ids)
+    Cache.strain_pages = False
+
+    pages = [server.pages[mal_id] for mal_id in sorted(server.pages)]
+    for parser in ["html.parser", "lxml"]:
+        try:
+            BeautifulSoup("", parser)
+        except Exception:  # Parser backend not installed
+            continue
+        results["mal_anime_parse_" + parser] = measure(
+            lambda page: AnimePageParser.parse(BeautifulSoup(page, parser)),
+            pages * args.repeat
+        )
+
+    username = "list" + str(args.list_size)
+    list_ids = list(range(1, args.list_size + 1))
+    for mal_id in list_ids:  # Warm the anime records
+        MalAnime(mal_id).load()
+    for stream in [False, True]:
+        Cache.stream_user_xml = stream
+        suffix = "_streamed" if stream else ""
+        clear("users", "user_indexes")
+        results["user_anime_list" + suffix] = measure(
+            UserAnimeList, [username]
+        )
+        clear("users", "user_indexes")
+        results["user_mal_anime" + suffix] = measure(
+            lambda x: UserMalAnime(x, username, lazy=False), list_ids
+        )
+
+    def preload(workers: int or None):
+        Cache.initialized = False
+        Cache.disk_index = None
+        clear("anime", "anime_records")
+        Cache(preload=True, workers=workers).cached_ids("anime")
+
+    results["cache_preload_lazy"] = measure(preload, [None])
+    results["cache_preload_eager"] = measure(preload, [args.workers])
+
+    server.stop()
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_file: str,
+            threshold: float) -> List[str]:
+    """
+    Compares benchmark results to a baseline
+    :param results: The current results
+    :param baseline_file: The JSON file containing the baseline results
+    :param threshold: The relative slowdown of the mean duration that is
+                      considered a regression
+    :return: Descriptions of the regressions
+    """
+    with open(baseline_file, "r") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before = baseline[name]["mean_ms"]
+        after = result["mean_ms"]
+        if before > 0 and (after - before) / before > threshold:
+            regressions.append("{}: {:.3f} ms -> {:.3f} ms".format(
+                name, before, after
+            ))
+    return regressions
+
+
+def main():
+    """
+    Runs the benchmark suite and prints the results as JSON
+    :return: None
+    """
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--pages", type=int, default=50,
+                            help="The amount of anime pages to load")
+    arg_parser.add_argument("--list-size", type=int, default=500,
+                            help="The amount of entries in the user list")
+    arg_parser.add_argument("--repeat", type=int, default=10,
+                            help="How often each fixture page is parsed")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                            help="The amount of processes for parsing")
+    arg_parser.add_argument("--latency", type=float, default=0.0,
+                            help="Artificial latency of the stub server")
+    arg_parser.add_argument("--backend", default="directory",
+                            choices=["directory", "sqlite"],
+                            help="The disk cache backend")
+    arg_parser.add_argument("--output",
+                            help="Writes the results to this file")
+    arg_parser.add_argument("--compare",
+                            help="A previous result file to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="The relative slowdown considered "
+                                 "a regression")
+    args = arg_parser.parse_args()
+
+    cache_root = tempfile.mkdtemp()
+    try:
+        results = run(args, cache_root)
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    with open(os.path.join(os.path.dirname(__file__), "..", "version")) \
+            as f:
+        version = f.read().strip()
+    report = json.dumps({
+        "version": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "parameters": vars(args),
+        "results": results
+    }, indent=4, sort_keys=True)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+
+    if args.compare is not None:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print("Regression: " + regression, file=sys.stderr)
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
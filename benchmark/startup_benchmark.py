@@ -0,0 +1,141 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+from run_benchmarks import root, summarize
+
+
+def measure_import(module: str, repeat: int) -> List[float]:
+    """
+    Measures the duration of importing a module in fresh interpreters
+    :param module: The module to import
+    :param repeat: The amount of interpreters to start
+    :return: The durations in seconds
+    """
+    script = "import time\n" \
+             "start = time.perf_counter()\n" \
+             "import " + module + "\n" \
+             "print(time.perf_counter() - start)\n"
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = root
+    durations = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", script], env=environment, cwd=root
+        )
+        durations.append(float(output.decode("utf-8").strip()))
+    return durations
+
+
+def imported_dependencies(module: str) -> List[str]:
+    """
+    Checks which of the heavy dependencies are imported by a module
+    :param module: The module to import
+    :return: The names of the imported dependencies
+    """
+    script = "import sys\n" \
+             "import " + module + "\n" \
+             "print(' '.join(name for name in ['bs4', 'requests', " \
+             "'asyncio', 'sqlite3'] if name in sys.modules))\n"
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = root
+    output = subprocess.check_output(
+        [sys.executable, "-c", script], env=environment, cwd=root
+    )
+    return output.decode("utf-8").split()
+
+
+def measure_constructors(repeat: int, batch: int = 1000) \
+        -> Dict[str, List[float]]:
+    """
+    Measures the duration of constructing Cache and MalAnime objects
+    after the cache was set up
+    :param repeat: The amount of batches to measure
+    :param batch: The amount of objects constructed per batch
+    :return: The average durations per object of each batch in seconds,
+             indexed by the name of the constructor
+    """
+    from malscraper.Cache import Cache
+    from malscraper.MalAnime import MalAnime
+
+    Cache()
+    durations = {}
+    for name, constructor in [
+        ("cache_constructor", Cache),
+        ("cache_shared", Cache.shared),
+        ("mal_anime_constructor", lambda: MalAnime(1))
+    ]:
+        durations[name] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(batch):
+                constructor()
+            durations[name].append((time.perf_counter() - start) / batch)
+    return durations
+
+
+def run(repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Runs the startup benchmarks. The cache should be configured to use
+    a temporary directory beforehand
+    :param repeat: How often each measurement is repeated
+    :return: The results of the benchmarks
+    """
+    results = {}
+    for module in ["malscraper.MalAnime", "malscraper.UserMalAnime"]:
+        name = "import_" + module.split(".")[-1]
+        results[name] = summarize(measure_import(module, repeat))
+    for name, durations in measure_constructors(repeat).items():
+        results[name] = summarize(durations)
+    return results
+
+
+def main():
+    """
+    Runs the startup benchmarks and prints the results as JSON
+    :return: None
+    """
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--repeat", type=int, default=10,
+                            help="How often each measurement is repeated")
+    args = arg_parser.parse_args()
+
+    from malscraper.Cache import Cache
+    cache_root = tempfile.mkdtemp()
+    Cache.configure(root=cache_root)
+    try:
+        results = run(args.repeat)
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    results["imported_dependencies"] = \
+        imported_dependencies("malscraper.UserMalAnime")
+    print(json.dumps(results, indent=4, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+fixture_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "fixtures")
+
+
+class StubServer(object):
+    """
+    Local HTTP stand-in for myanimelist.net that serves the recorded
+    fixtures. Anime and manga pages without a fixture of their own are
+    served one of the recorded pages. The XML list of a user named
+    "list<N>" consists of N entries generated from the recorded list.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Loads the fixtures
+        :param latency: Artificial delay in seconds added to each response
+        """
+        self.latency = latency
+        self.requests = 0
+        self.pages = {}
+        for name in sorted(os.listdir(fixture_dir)):
+            match = re.match(r"anime_(\d+)\.html$", name)
+            if match is not None:
+                with open(os.path.join(fixture_dir, name), "r") as f:
+                    self.pages[int(match.group(1))] = f.read()
+        with open(os.path.join(fixture_dir, "user.xml"), "r") as f:
+            self.user_xml = f.read()
+        self.server = None
+        self.thread = None
+
+    def start(self) -> str:
+        """
+        Starts the server on a free local port in a background thread
+        :return: The base URL of the server
+        """
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+        return "http://127.0.0.1:" + str(self.server.server_address[1])
+
+    def stop(self):
+        """
+        Stops the server
+        :return: None
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        """
+        Answers a request
+        :param request: The request
+        :return: None
+        """
+        self.requests += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        url = urlparse(request.path)
+        match = re.match(r"/(anime|manga)/(\d+)", url.path)
+        if match is not None:
+            body = self.page(int(match.group(2)))
+            content_type = "text/html"
+        elif url.path == "/malappinfo.php":
+            body = self.user_list(parse_qs(url.query)["u"][0])
+            content_type = "text/xml"
+        else:
+            body = None
+            content_type = "text/plain"
+
+        if body is None:
+            request.send_response(404)
+            request.end_headers()
+            return
+
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            request.send_response(304)
+            request.send_header("ETag", etag)
+            request.end_headers()
+            return
+
+        encoded = body.encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", content_type + "; charset=UTF-8")
+        request.send_header("Content-Length", str(len(encoded)))
+        request.send_header("ETag", etag)
+        request.end_headers()
+        request.wfile.write(encoded)
+
+    def page(self, mal_id: int) -> str:
+        """
+        Generates the page of an anime or manga
+        :param mal_id: The ID of the anime or manga
+        :return: The recorded page of the ID or a substitute
+        """
+        if mal_id in self.pages:
+            return self.pages[mal_id]
+        ids = sorted(self.pages)
+        return self.pages[ids[mal_id % len(ids)]]
+
+    def user_list(self, username: str) -> str or None:
+        """
+        Generates the XML list of a user
+        :param username: The username
+        :return: The recorded list, a generated list or None if the user
+                 does not exist
+        """
+        match = re.match(r"list(\d+)$", username)
+        if username == "fixture":
+            return self.user_xml
+        elif match is None:
+            return None
+
+        entries = re.findall(r"\t<anime>.*?</anime>", self.user_xml, re.S)
+        generated = []
+        for mal_id in range(1, int(match.group(1)) + 1):
+            entry = entries[mal_id % len(entries)]
+            generated.append(re.sub(
+                r"<series_animedb_id>\d+</series_animedb_id>",
+                "<series_animedb_id>" + str(mal_id) + "</series_animedb_id>",
+                entry
+            ))
+        head, tail = self.user_xml.split(entries[0], 1)
+        tail = tail.rsplit("</anime>", 1)[1]
+        return head + "\n".join(generated) + tail
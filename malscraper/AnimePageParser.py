@@ -0,0 +1,147 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import re
+import time
+from typing import TYPE_CHECKING, Dict
+from malscraper.Metrics import Metrics
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, SoupStrainer
+    from bs4.element import Tag
+
+
+class AnimePageParser(object):
+    """
+    Class that extracts the fields of a myanimelist anime or manga page
+    in a single pass over the parsed page
+    """
+
+    version = 1
+    """
+    The version of the extraction logic. Must be incremented whenever the
+    extracted fields change, which invalidates all cached records
+    """
+
+    regions = ["h1", "js-scrollfix-bottom", "anime_detail_related_anime"]
+    """
+    The classes of the page regions containing the extracted fields:
+    The header, the information sidebar and the table of related series
+    """
+
+    related_link = re.compile(r"^/(anime|manga)/(\d+)(/|$)")
+    """
+    Matches the links to related series. Other links in the table of
+    related series are ignored
+    """
+
+    @staticmethod
+    def strainer() -> "SoupStrainer":
+        """
+        Generates a strainer that limits parsing a page to the regions
+        required for extracting its fields, skipping scripts, reviews and
+        the like. This reduces both the parsing time and the size
+        of the parsed page.
+        :return: The strainer, to be passed to BeautifulSoup as parse_only
+        """
+        from bs4 import SoupStrainer
+        return SoupStrainer(attrs={"class": AnimePageParser.regions})
+
+    @staticmethod
+    def parse(soup: "BeautifulSoup") -> Dict[str, object]:
+        """
+        Extracts the name, the related series, the airing status and the
+        episode count of a page. The page is only traversed once; the
+        values of the information sidebar are read from the siblings of
+        their labels.
+        If metrics are enabled, the time spent extracting the name, the
+        sidebar information and the related series is recorded.
+        :param soup: The parsed page
+        :return: A dictionary containing the extracted fields.
+                 The airing status is the raw status string.
+        """
+        fields = {
+            "name": None,
+            "related_anime": [],
+            "related_manga": [],
+            "airing_status": None,
+            "episode_count": None
+        }
+        info = {}
+        related_found = False
+        timed = Metrics.enabled
+        durations = {"name": 0.0, "info": 0.0, "related": 0.0}
+
+        for tag in soup.find_all(["h1", "span", "table"]):
+            classes = tag.get("class") or []
+            if timed:
+                start = time.perf_counter()
+
+            if tag.name == "h1":
+                field = "name"
+                if fields["name"] is None:
+                    fields["name"] = tag.text
+
+            elif tag.name == "span":
+                field = "info"
+                if "dark_text" in classes:
+                    label = tag.text.strip()
+                    if label not in info:
+                        info[label] = AnimePageParser.__parse_info_value(tag)
+
+            elif "anime_detail_related_anime" in classes \
+                    and not related_found:
+                field = "related"
+                related_found = True
+                for entry in tag.find_all("a"):
+                    match = AnimePageParser.related_link.match(
+                        entry.get("href", "")
+                    )
+                    if match is not None:
+                        fields["related_" + match.group(1)].append(
+                            int(match.group(2))
+                        )
+            else:
+                field = "info"
+
+            if timed:
+                durations[field] += time.perf_counter() - start
+
+        fields["airing_status"] = info.get("Status:")
+        try:
+            fields["episode_count"] = int(info.get("Episodes:"))
+        except (TypeError, ValueError):
+            pass
+
+        if timed:
+            for field, duration in durations.items():
+                Metrics.observe("extract_seconds", duration, field=field)
+
+        return fields
+
+    @staticmethod
+    def __parse_info_value(label: "Tag") -> str:
+        """
+        Parses the value of an entry in the information sidebar
+        :param label: The label of the entry
+        :return: The text following the label
+        """
+        return "".join([
+            sibling if isinstance(sibling, str) else sibling.get_text()
+            for sibling in label.next_siblings
+        ]).strip()
@@ -18,11 +18,31 @@ along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
 import os
-import sys
+import json
+import pickle
 import time
-import requests
-from bs4 import BeautifulSoup
+import zlib
+import random
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Set, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from malscraper.types.MediaType import MediaType
+from malscraper.types.AiringState import AiringState
+from malscraper.Metrics import Metrics
+from malscraper.LruCache import LruCache
+from malscraper.RateLimiter import RateLimiter
+from malscraper.SingleFlight import SingleFlight
+from malscraper.AnimePageParser import AnimePageParser
+from malscraper.UserAnimeEntry import UserAnimeEntry
+from malscraper.UserListChange import UserListChange
+from malscraper.storage.DirectoryStore import DirectoryStore
+from malscraper.Transport import Transport, SessionTransport, HttpResponse
+from malscraper.exceptions.NotFoundError import NotFoundError
+from malscraper.exceptions.RetryLimitExceededError import \
+    RetryLimitExceededError
+if TYPE_CHECKING:  # Only needed for type hints
+    from bs4 import BeautifulSoup
 
 
 class Cache:
@@ -37,54 +57,473 @@ class Cache:
     """
 
     in_memory = {
-        MediaType.ANIME.value: {},
-        MediaType.MANGA.value: {},
-        "users": {}
+        MediaType.ANIME.value: LruCache(max_entries=256, max_bytes=2 ** 30),
+        MediaType.MANGA.value: LruCache(max_entries=256, max_bytes=2 ** 30),
+        MediaType.ANIME.value + "_records": LruCache(max_entries=100000),
+        MediaType.MANGA.value + "_records": LruCache(max_entries=100000),
+        "users": LruCache(max_entries=32, max_bytes=2 ** 30),
+        "user_indexes": LruCache(max_entries=32)
     }
     """
-    In-Memory cache
+    In-Memory cache, consisting of a bounded LRU cache per namespace.
+    The limits can be changed using configure_memory
+    """
+
+    tree_overhead = 10
+    """
+    Approximate ratio of the memory used by a parse tree to the size of
+    the parsed document. Used to estimate the size of in-memory entries
     """
 
     flush_time = 86400  # Keep data for one day
     """
-    Specifies the flush time for the cached data
+    Specifies the flush time for the cached data. Used for all entries
+    without a status-specific time to live in ttls
+    """
+
+    ttls = {
+        MediaType.ANIME.value: {
+            AiringState.FINISHED.value: 30 * 86400,
+            AiringState.AIRING.value: 6 * 3600,
+            AiringState.NOT_YET_AIRED.value: 86400
+        },
+        MediaType.MANGA.value: {
+            "Finished": 30 * 86400,
+            "Publishing": 86400
+        }
+    }
+    """
+    The time to live in seconds of cached pages, depending on their media
+    type and the airing status displayed on the page
+    """
+
+    ttl_jitter = 0.1
+    """
+    The relative amount by which the time to live of an entry is varied,
+    which spreads out the expiry of entries cached at the same time
+    """
+
+    refresh_ahead = None  # type: float
+    """
+    If set, pages whose records are accessed after this fraction of their
+    time to live passed are refreshed in the background before they
+    expire. For example, 0.8 renews frequently used pages once 80%
+    of their time to live passed
+    """
+
+    base_url = "https://myanimelist.net"
+    """
+    The base URL of myanimelist.net. Can be pointed to a local server
+    that serves recorded pages for tests and benchmarks
+    """
+
+    transport = SessionTransport()  # type: Transport
+    """
+    The transport used to fetch data. Uses a pooled keep-alive session by
+    default and can be replaced using set_transport
+    """
+
+    html_parser = "html.parser"
+    """
+    The parser backend used by BeautifulSoup to parse HTML pages.
+    Can be set to a faster backend like "lxml" if it is installed
+    """
+
+    strain_pages = False
+    """
+    If enabled, pages that are not in memory are only partially parsed
+    when extracting their records, limited to the regions that contain
+    the extracted fields. Accessing a page still parses the whole page
+    """
+
+    stream_user_xml = False
+    """
+    If enabled, user XML data is parsed incrementally when indexing a
+    user's list, which keeps the memory usage flat for large lists.
+    The SQLite backend still loads the compressed list as a whole
+    """
+
+    record_listeners = []
+    """
+    Callbacks that are notified whenever the record of a page is stored.
+    They are called with the media type, the ID and the extracted fields
+    """
+
+    user_list_listeners = []
+    """
+    Callbacks that are notified about changes of users' lists. Whenever a
+    user's XML data is refreshed and changed, they are called with the
+    username and the list of UserListChange objects
+    """
+
+    stale_while_revalidate = False
+    """
+    If enabled, expired entries that are still stored in the disk cache
+    are returned right away and refreshed in the background
+    """
+
+    background_executor = None  # type: ThreadPoolExecutor
+    """
+    The thread pool executing background refreshes, created on first use
+    """
+
+    background_refreshes = set()
+    """
+    The keys of the entries that are currently refreshed in the background
+    """
+
+    background_lock = threading.Lock()
+    """
+    Lock protecting the background refresh state
+    """
+
+    compression = "gzip"
+    """
+    The compression codec used for the disk cache: "gzip", "zstd"
+    (requires the zstandard package) or None
+    """
+
+    backend = "directory"
+    """
+    The backend of the disk cache. Either "directory", which stores one
+    file per entry, or "sqlite", which stores all entries in a single
+    database that can be shared by multiple processes
+    """
+
+    store = None
+    """
+    The Store holding the disk cache. Unless set beforehand, the store
+    for the configured backend is created by the first constructor call
+    """
+
+    migrated = False
+    """
+    Set to true once entries of the legacy disk cache layout were migrated
+    """
+
+    setup_lock = threading.Lock()
+    """
+    Lock protecting the initialization of the shared cache state
+    """
+
+    single_flight = None  # type: SingleFlight
+    """
+    De-duplicates concurrent loads and downloads of the same entry,
+    both within this process and across processes using the same cache
+    directory. Created by the first constructor call
+    """
+
+    rate_limiter = None  # type: RateLimiter
+    """
+    The rate limiter shared by all fetches. Unless replaced, a limiter that
+    is shared with all other processes using the same cache directory
+    is created by the first constructor call
+    """
+
+    max_retries = 8
+    """
+    The maximum amount of times a failed request is retried
+    """
+
+    backoff_base = 1.0
+    """
+    The base delay in seconds of the exponential backoff between retries
+    """
+
+    backoff_cap = 60.0
+    """
+    The maximum delay in seconds between retries
+    """
+
+    disk_index = None  # type: Dict[str, Set[int or str]]
+    """
+    Index of the entries stored in the disk cache, built on first use
     """
 
-    def __init__(self, preload: bool = False):
+    root = None  # type: str
+    """
+    The directory of the disk cache. Defaults to ~/.malscraper if not set.
+    Can be changed using configure
+    """
+
+    cache_dir = None  # type: str
+    """
+    The directory of the disk cache, resolved by the first constructor call
+    """
+
+    anime_cache_dir = None  # type: str
+    """
+    The directory of the cached anime pages
+    """
+
+    manga_cache_dir = None  # type: str
+    """
+    The directory of the cached manga pages
+    """
+
+    user_cache_dir = None  # type: str
+    """
+    The directory of the cached user data
+    """
+
+    ready = False
+    """
+    Set to true once the shared state of the cache was set up. Afterwards,
+    constructing a Cache object does not access the filesystem
+    """
+
+    shared_instance = None  # type: Cache
+    """
+    The Cache object returned by shared
+    """
+
+    process_start_method = None  # type: str
+    """
+    The start method of the worker processes used by load_mal_records,
+    for example "spawn". None uses the default of the platform
+    """
+
+    worker_settings = [
+        "root", "backend", "compression", "base_url", "transport",
+        "html_parser", "strain_pages", "stream_user_xml", "max_retries",
+        "backoff_base", "backoff_cap", "ttls", "ttl_jitter",
+        "refresh_ahead", "flush_time", "stale_while_revalidate"
+    ]
+    """
+    The class attributes that are passed on to worker processes. The
+    transport therefore needs to be picklable to use worker processes
+    """
+
+    def __init__(self, preload: bool = False, workers: int = None):
         """
-        Initializes the cache directories
-        :param preload: Preloads the current cache into memory
+        Initializes the cache directories. The directories are only set up
+        by the first constructor call.
+        :param preload: Preloads the current cache. By default, this only
+                        prepares an index of the cached entries, which are
+                        then parsed on demand.
+        :param workers: If provided while preloading, eagerly extracts the
+                        records of all cached anime and manga pages into
+                        memory using a pool of this many processes
         """
+        if not Cache.ready:
+            self.__setup()
 
-        self.cache_dir = os.path.join(os.path.expanduser("~"), ".malscraper")
-        self.anime_cache_dir = os.path.join(self.cache_dir, "anime")
-        self.manga_cache_dir = os.path.join(self.cache_dir, "manga")
-        self.user_cache_dir = os.path.join(self.cache_dir, "users")
+        if preload:
+            self.cached_ids(MediaType.ANIME.value)
+            if workers is not None and not Cache.initialized:
+                Cache.initialized = True
+                self.__preload_records(workers)
 
-        for directory in [self.anime_cache_dir, self.manga_cache_dir,
-                          self.user_cache_dir]:
-            if not os.path.isdir(directory):
-                os.makedirs(directory)
+    @staticmethod
+    def shared() -> "Cache":
+        """
+        Retrieves a Cache object shared by all users of the cache
+        :return: The shared Cache object
+        """
+        if Cache.shared_instance is None:
+            Cache.shared_instance = Cache()
+        return Cache.shared_instance
 
-            if preload and not Cache.initialized:
+    @staticmethod
+    def configure(root: str = None, backend: str = None) -> "Cache":
+        """
+        Changes the location of the disk cache. The shared state of the
+        cache is set up again on the next constructor call and any data
+        loaded from the previous location is discarded from memory.
+        :param root: The directory of the disk cache,
+                     None to use ~/.malscraper. Existing files in the
+                     directory are left untouched.
+        :param backend: Optionally changes the backend of the disk cache
+        :return: The shared Cache object using the new configuration
+        """
+        with Cache.setup_lock:
+            if Cache.store is not None:
+                Cache.store.close()
+            if Cache.rate_limiter is not None \
+                    and Cache.cache_dir is not None \
+                    and Cache.rate_limiter.state_file is not None \
+                    and Cache.rate_limiter.state_file.startswith(
+                        Cache.cache_dir + os.sep
+                    ):
+                Cache.rate_limiter = None
 
-                for element in os.listdir(directory):  # Load cached files
+            Cache.root = root
+            if backend is not None:
+                Cache.backend = backend
+            Cache.store = None
+            Cache.single_flight = None
+            Cache.disk_index = None
+            Cache.migrated = False
+            Cache.initialized = False
+            Cache.shared_instance = None
+            Cache.ready = False
+            for cache in Cache.in_memory.values():
+                cache.clear()
 
-                    if directory == self.anime_cache_dir:
-                        media_type = MediaType.ANIME
-                    elif directory == self.manga_cache_dir:
-                        media_type = MediaType.MANGA
-                    else:
-                        media_type = None
+        return Cache.shared()
 
-                    if media_type is not None:
-                        element_id = int(element)
-                        self.load_mal_page(element_id, media_type)
+    def __setup(self):
+        """
+        Sets up the disk cache, the de-duplication of concurrent loads and
+        the rate limiter, unless they were set up already
+        :return: None
+        """
+        with Cache.setup_lock:
+            if Cache.ready:
+                return
 
-                    else:
-                        self.load_user_xml(element)
+            Cache.cache_dir = Cache.root or os.path.join(
+                os.path.expanduser("~"), ".malscraper"
+            )
+            Cache.anime_cache_dir = os.path.join(Cache.cache_dir, "anime")
+            Cache.manga_cache_dir = os.path.join(Cache.cache_dir, "manga")
+            Cache.user_cache_dir = os.path.join(Cache.cache_dir, "users")
 
-                Cache.initialized = True
+            if Cache.store is None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                if Cache.backend == "sqlite":
+                    from malscraper.storage.SqliteStore import SqliteStore
+                    Cache.store = SqliteStore(
+                        os.path.join(self.cache_dir, "cache.sqlite"),
+                        Cache.compression
+                    )
+                elif Cache.backend == "directory":
+                    Cache.store = DirectoryStore(self.cache_dir,
+                                                 Cache.compression)
+                else:
+                    raise ValueError("Invalid backend: " + Cache.backend)
+
+            if not Cache.migrated:
+                self.__migrate()
+                Cache.migrated = True
+
+            if Cache.single_flight is None:
+                Cache.single_flight = SingleFlight(
+                    os.path.join(self.cache_dir, "locks")
+                )
+
+            if Cache.rate_limiter is None:
+                Cache.rate_limiter = RateLimiter(
+                    state_file=os.path.join(self.cache_dir, "ratelimit")
+                )
+
+            Cache.ready = True
+
+    def cached_ids(self, namespace: str) -> Set[int or str]:
+        """
+        Retrieves the IDs of all entries stored in the disk cache.
+        Only lists the cache directories on first use.
+        :param namespace: The namespace, for example "anime" or "users"
+        :return: The IDs of the anime/manga or the cached usernames
+        """
+        if Cache.disk_index is None:
+            index = {}
+            for name in [MediaType.ANIME.value, MediaType.MANGA.value,
+                         "users"]:
+                entries = Cache.store.keys(name)
+                if name != "users":
+                    entries = [int(entry) for entry in entries]
+                index[name] = set(entries)
+            Cache.disk_index = index
+        return Cache.disk_index[namespace]
+
+    def __migrate(self):
+        """
+        Moves entries stored in the legacy layout of uncompressed files in
+        flat directories into the store. The migration only runs once,
+        which is recorded by a marker file. Since only the default cache
+        directory used that layout, other directories configured using
+        configure are never migrated.
+        :return: None
+        """
+        legacy_dir = os.path.join(os.path.expanduser("~"), ".malscraper")
+        marker = os.path.join(self.cache_dir, ".migrated")
+        if os.path.realpath(self.cache_dir) != os.path.realpath(legacy_dir) \
+                or os.path.isfile(marker):
+            return
+
+        if isinstance(Cache.store, DirectoryStore) \
+                and Cache.store.root == self.cache_dir:
+            for namespace in [MediaType.ANIME.value, MediaType.MANGA.value,
+                              "users"]:
+                Cache.store.migrate(namespace)
+            open(marker, "w").close()
+
+    def __preload_records(self, workers: int):
+        """
+        Extracts the records of all cached anime and manga pages using a
+        process pool and stores them in memory
+        :param workers: The amount of worker processes
+        :return: None
+        """
+        for media_type in [MediaType.ANIME, MediaType.MANGA]:
+            self.load_mal_records(
+                list(self.cached_ids(media_type.value)), media_type, workers
+            )
+
+    def load_mal_records(self, mal_ids: List[int], media_type: MediaType,
+                         workers: int = None) -> Dict[int, Dict[str, object]]:
+        """
+        Loads the fields of multiple myanimelist pages. Records that are
+        not available in memory are extracted by a pool of worker
+        processes, which only send back the extracted fields instead of
+        the parsed pages. The records are stored in memory afterwards.
+        :param mal_ids: The IDs of the anime/manga
+        :param media_type: The type of media to load
+        :param workers: The amount of worker processes.
+                        Defaults to the amount of CPUs
+        :return: The extracted fields, indexed by the IDs
+        :raises TypeError: If the transport can not be sent to the
+                           worker processes because it is not picklable
+        """
+        namespace = media_type.value + "_records"
+        loaded = {}
+        jobs = []
+        for mal_id in mal_ids:
+            record = Cache.in_memory[namespace].get(mal_id)
+            if record is not None \
+                    and not Cache.__record_expired(media_type, mal_id, record):
+                loaded[mal_id] = record["fields"]
+            elif mal_id not in loaded:
+                loaded[mal_id] = None
+                jobs.append((mal_id, media_type))
+
+        if len(jobs) == 0:
+            return loaded
+
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, min(64, len(jobs) // (4 * workers)))
+        settings = {name: getattr(Cache, name)
+                    for name in Cache.worker_settings}
+        limiter = Cache.rate_limiter
+        settings["rate_limiter"] = \
+            (limiter.rate, limiter.burst, limiter.state_file)
+        try:
+            settings = pickle.dumps(settings)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise TypeError(
+                "The transport and settings of the cache must be picklable "
+                "to be used by worker processes: " + str(e)
+            )
+
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        context = None
+        if Cache.process_start_method is not None:
+            context = multiprocessing.get_context(Cache.process_start_method)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker,
+                                 initargs=(settings,)) as executor:
+            records = executor.map(_load_record, jobs, chunksize=chunksize)
+            for (mal_id, _), record in zip(jobs, records):
+                Cache.in_memory[namespace].put(
+                    mal_id, record, Cache.__estimate_size(record)
+                )
+                loaded[mal_id] = record["fields"]
+                for listener in Cache.record_listeners:
+                    listener(media_type, mal_id, record["fields"])
+
+        return loaded
 
     def load_mal_page(self, mal_id: int, media_type: MediaType):
         """
@@ -94,95 +533,854 @@ class Cache:
         :return: The HTML data
         """
 
-        if mal_id in Cache.in_memory[media_type.value]:
-            return Cache.in_memory[media_type.value][mal_id]
+        cached = Cache.in_memory[media_type.value].get(mal_id)
+        if cached is not None:
+            Metrics.increment("cache_hits_total", layer="memory",
+                              namespace=media_type.value)
+            return cached
 
         else:
-            if media_type == MediaType.ANIME:
-                cache_dir = self.anime_cache_dir
-            elif media_type == MediaType.MANGA:
-                cache_dir = self.manga_cache_dir
-            else:
-                print("Invalid Media Type")
-                sys.exit(1)
+            Metrics.increment("cache_misses_total", layer="memory",
+                              namespace=media_type.value)
+            return Cache.single_flight.run(
+                ("page", media_type.value, mal_id),
+                lambda: self.__parse_mal_page(mal_id, media_type)
+            )
 
-            cache_file = os.path.join(cache_dir, str(mal_id))
+    def __parse_mal_page(self, mal_id: int, media_type: MediaType) \
+            -> "BeautifulSoup":
+        """
+        Parses a myanimelist page from the disk cache, refreshing
+        it if necessary, and stores it in memory
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media to load
+        :return: The HTML data
+        """
+        self.refresh_mal_page(mal_id, media_type)
+        data = Cache.store.read(media_type.value, mal_id)
 
-            if self._needs_refresh(cache_file):
-                url = "https://myanimelist.net/" + media_type.value + "/"
-                url += str(mal_id)
-                data = self._get_url_data(url)
-                with open(cache_file, "w") as f:
-                    f.write(data)
-            else:
-                with open(cache_file, "r") as f:
-                    data = f.read()
+        from bs4 import BeautifulSoup
+        with Metrics.timer("parse_seconds", document=media_type.value):
+            generated = BeautifulSoup(data, Cache.html_parser)
+        Cache.in_memory[media_type.value].put(
+            mal_id, generated, len(data) * Cache.tree_overhead
+        )
+        return generated
 
-            generated = BeautifulSoup(data, "html.parser")
-            Cache.in_memory[media_type.value][mal_id] = generated
-            return generated
+    def refresh_mal_page(self, mal_id: int, media_type: MediaType):
+        """
+        Makes sure that a myanimelist page is stored in the disk cache
+        and is up to date. If stale_while_revalidate is enabled, an
+        expired page is revalidated in the background instead.
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media to refresh
+        :return: None
+        """
+        if media_type not in [MediaType.ANIME, MediaType.MANGA]:
+            raise ValueError("Invalid Media Type: " + str(media_type))
+
+        if self._needs_refresh(media_type.value, mal_id):
+            self.__revalidate(
+                (media_type.value, mal_id),
+                lambda: self.__refresh_page(mal_id, media_type)
+            )
+
+    def __refresh_page(self, mal_id: int, media_type: MediaType):
+        """
+        Refreshes a cached myanimelist page. If the page changed, the
+        in-memory page and its record are discarded, otherwise the
+        record's timestamp is renewed.
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media to refresh
+        :return: None
+        """
+        namespace = media_type.value
+        url = Cache.base_url + "/" + namespace + "/" + str(mal_id)
+        if self.__refresh_entry(url, namespace, mal_id):
+            Cache.in_memory[namespace].pop(mal_id, None)
+            self.__discard_record(mal_id, media_type)
+        else:
+            record = self.__read_record(mal_id, media_type)
+            if record is not None:
+                record["timestamp"] = Cache.store.mtime(namespace, mal_id)
+                self.__write_record(mal_id, media_type, record)
+
+    def load_mal_record(self, mal_id: int, media_type: MediaType) \
+            -> Dict[str, object]:
+        """
+        Loads the fields extracted from a myanimelist page.
+        The extracted fields are stored in a record cache, which allows
+        loading them without parsing the page again. Records are
+        invalidated once the page changes or the extraction logic changes.
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media to load
+        :return: The extracted fields, as generated by AnimePageParser
+        """
+        record = self.__read_record(mal_id, media_type)
+
+        if record is not None \
+                and Cache.__record_expired(media_type, mal_id, record):
+            record = self.__current_record(mal_id, media_type, record)
+            if record is not None \
+                    and Cache.__record_expired(media_type, mal_id, record):
+                self.refresh_mal_page(mal_id, media_type)
+                if not Cache.stale_while_revalidate:
+                    record = self.__current_record(
+                        mal_id, media_type,
+                        self.__read_record(mal_id, media_type)
+                    )
+
+        elif record is not None and Cache.refresh_ahead is not None \
+                and Cache.__record_expired(media_type, mal_id, record,
+                                           Cache.refresh_ahead):
+            self.__refresh_ahead(mal_id, media_type, record["timestamp"])
+
+        if record is None:
+            record = Cache.single_flight.run(
+                ("record", media_type.value, mal_id),
+                lambda: self.__extract_record(mal_id, media_type)
+            )
+
+        return record["fields"]
+
+    def cached_record(self, mal_id: int, media_type: MediaType) \
+            -> Dict[str, object] or None:
+        """
+        Loads the fields extracted from a myanimelist page if they are
+        stored in the cache, without fetching or parsing the page
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media to load
+        :return: The extracted fields or None if no current record exists
+        """
+        record = self.__read_record(mal_id, media_type)
+        return None if record is None else record["fields"]
+
+    def __extract_record(self, mal_id: int, media_type: MediaType) \
+            -> Dict[str, object]:
+        """
+        Extracts the record of a myanimelist page and stores it.
+        If strain_pages is enabled, a page that is not in memory is only
+        parsed partially and not kept in memory.
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media to load
+        :return: The record
+        """
+        namespace = media_type.value
+        if Cache.strain_pages and mal_id not in Cache.in_memory[namespace]:
+            self.refresh_mal_page(mal_id, media_type)
+            data = Cache.store.read(namespace, mal_id)
+            from bs4 import BeautifulSoup
+            with Metrics.timer("parse_seconds",
+                               document=namespace + "_strained"):
+                soup = BeautifulSoup(data, Cache.html_parser,
+                                     parse_only=AnimePageParser.strainer())
+        else:
+            soup = self.load_mal_page(mal_id, media_type)
+
+        record = {
+            "version": AnimePageParser.version,
+            "timestamp": Cache.store.mtime(namespace, mal_id),
+            "fields": AnimePageParser.parse(soup)
+        }
+        self.__write_record(mal_id, media_type, record)
+        return record
+
+    def __read_record(self, mal_id: int, media_type: MediaType) \
+            -> Dict[str, object] or None:
+        """
+        Reads the record of a page from memory or from the disk cache
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media
+        :return: The record or None if no record generated by the current
+                 version of the extraction logic exists
+        """
+        namespace = media_type.value + "_records"
+        record = Cache.in_memory[namespace].get(mal_id)
+
+        if record is not None:
+            Metrics.increment("cache_hits_total", layer="memory",
+                              namespace=namespace)
+        else:
+            Metrics.increment("cache_misses_total", layer="memory",
+                              namespace=namespace)
+            try:
+                record = json.loads(Cache.store.read(namespace, mal_id))
+            except (TypeError, ValueError):
+                Metrics.increment("cache_misses_total", layer="disk",
+                                  namespace=namespace)
+                return None
+            Metrics.increment("cache_hits_total", layer="disk",
+                              namespace=namespace)
+
+        if record["version"] != AnimePageParser.version:
+            return None
+
+        Cache.in_memory[namespace].put(mal_id, record,
+                                       Cache.__estimate_size(record))
+        return record
+
+    def __current_record(self, mal_id: int, media_type: MediaType,
+                         record: Dict[str, object] or None) \
+            -> Dict[str, object] or None:
+        """
+        Makes sure that a record was extracted from the currently stored
+        version of its page. If the page was refreshed since, for example
+        by another process, the in-memory page and record are discarded
+        and the record is read from the disk cache again.
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media
+        :param record: The record to check
+        :return: The record, None if no record of the stored page exists
+        """
+        mtime = Cache.store.mtime(media_type.value, mal_id)
+        if record is None or mtime is None or record["timestamp"] >= mtime:
+            return record
+
+        Cache.in_memory[media_type.value].pop(mal_id, None)
+        Cache.in_memory[media_type.value + "_records"].pop(mal_id, None)
+        record = self.__read_record(mal_id, media_type)
+        if record is not None and record["timestamp"] < mtime:
+            return None
+        return record
+
+    def __write_record(self, mal_id: int, media_type: MediaType,
+                       record: Dict[str, object]):
+        """
+        Stores the record of a page in memory and in the disk cache
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media
+        :param record: The record to store
+        :return: None
+        """
+        namespace = media_type.value + "_records"
+        Cache.store.write(namespace, mal_id, json.dumps(record))
+        Cache.in_memory[namespace].put(
+            mal_id, record, Cache.__estimate_size(record)
+        )
+        for listener in Cache.record_listeners:
+            listener(media_type, mal_id, record["fields"])
 
-    def load_user_xml(self, username: str) -> BeautifulSoup:
+    @staticmethod
+    def __record_expired(media_type: MediaType, mal_id: int,
+                         record: Dict[str, object],
+                         fraction: float = 1.0) -> bool:
+        """
+        Checks if the page a record was extracted from expired
+        :param media_type: The media type of the page
+        :param mal_id: The ID of the anime/manga
+        :param record: The record
+        :param fraction: The fraction of the time to live after
+                         which the page counts as expired
+        :return: True if the page expired, False otherwise
+        """
+        ttl = Cache._ttl(media_type.value, mal_id, record["timestamp"],
+                         record["fields"]["airing_status"])
+        return time.time() - record["timestamp"] > ttl * fraction
+
+    def __refresh_ahead(self, mal_id: int, media_type: MediaType,
+                        timestamp: float):
+        """
+        Refreshes a page that did not expire yet in the background,
+        unless it is refreshed by someone else in the meantime
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media to refresh
+        :param timestamp: The modification time of the page as known to
+                          its record
+        :return: None
+        """
+        key = (media_type.value, mal_id)
+        Metrics.increment("refresh_ahead_total", namespace=key[0])
+        self.__in_background(key, lambda: Cache.single_flight.run(
+            ("refresh",) + key,
+            lambda: self.__refresh_page(mal_id, media_type),
+            lambda: (Cache.store.mtime(*key) or 0) > timestamp,
+            interprocess=True
+        ))
+
+    @staticmethod
+    def __index(namespace: str, key: int or str):
+        """
+        Adds a newly stored entry to the disk index, if it was built
+        :param namespace: The namespace of the entry
+        :param key: The ID or username of the entry
+        :return: None
+        """
+        if Cache.disk_index is not None:
+            Cache.disk_index[namespace].add(key)
+
+    def __discard_record(self, mal_id: int, media_type: MediaType):
+        """
+        Removes the record of a page, for example because the page
+        was downloaded again
+        :param mal_id: The ID of the anime/manga
+        :param media_type: The type of media
+        :return: None
+        """
+        namespace = media_type.value + "_records"
+        Cache.in_memory[namespace].pop(mal_id, None)
+        Cache.store.delete(namespace, mal_id)
+
+    def load_user_xml(self, username: str) -> "BeautifulSoup":
         """
         Loads a user's XML data
         :param username: The username to fetch the data for
         :return: The XML user data
         """
 
-        if username in Cache.in_memory["users"]:
-            return Cache.in_memory["users"][username]
+        cached = Cache.in_memory["users"].get(username)
+        if cached is not None:
+            Metrics.increment("cache_hits_total", layer="memory",
+                              namespace="users")
+            return cached
 
         else:
+            Metrics.increment("cache_misses_total", layer="memory",
+                              namespace="users")
+            self.refresh_user_xml(username)
+            data = Cache.store.read("users", username)
+
+            from bs4 import BeautifulSoup
+            with Metrics.timer("parse_seconds", document="users"):
+                generated = BeautifulSoup(data, features="xml")
+            Cache.in_memory["users"].put(
+                username, generated, len(data) * Cache.tree_overhead
+            )
+            return generated
 
-            user_cache_file = os.path.join(self.user_cache_dir, username)
-            if self._needs_refresh(user_cache_file):
-                url = "https://myanimelist.net/malappinfo.php?" \
-                      "type=anime&status=all&u=" + username
-                data = self._get_url_data(url)
-                with open(user_cache_file, "w") as f:
-                    f.write(data)
+    def refresh_user_xml(self, username: str):
+        """
+        Makes sure that a user's XML data is stored in the disk cache
+        and is up to date. If stale_while_revalidate is enabled, expired
+        data is revalidated in the background instead.
+        :param username: The username to refresh the data for
+        :return: None
+        """
+        if self._needs_refresh("users", username):
+            self.__revalidate(
+                ("users", username),
+                lambda: self.__refresh_user_xml(username)
+            )
+
+    def sync_user_list(self, username: str, refresh_pages: bool = False) \
+            -> List[UserListChange]:
+        """
+        Refreshes a user's XML data if it expired and compares the new list
+        with the previous one. The in-memory index of the list is replaced
+        with the new one instead of being rebuilt on demand.
+        :param username: The username to synchronize the list for
+        :param refresh_pages: If True, the pages of added and updated
+                              anime are refreshed as well, if they expired
+        :return: The added, removed and updated entries. Empty if the list
+                 did not expire or did not change
+        """
+        changes = []
+        if self._needs_refresh("users", username):
+            changes = Cache.single_flight.run(
+                ("refresh", "users", username),
+                lambda: self.__refresh_user_xml(username, True),
+                lambda: not self._needs_refresh("users", username),
+                interprocess=True
+            ) or []
 
+        if refresh_pages:
+            for change in changes:
+                if change.new is not None:
+                    self.refresh_mal_page(change.mal_id, MediaType.ANIME)
+        return changes
+
+    def __refresh_user_xml(self, username: str, track: bool = False) \
+            -> List[UserListChange]:
+        """
+        Refreshes a user's cached XML data. If the data changed, the
+        in-memory data of the user is discarded. If changes are tracked,
+        the new list is compared with the previous one, the listeners in
+        user_list_listeners are notified and the in-memory index is
+        replaced with the index of the new list.
+        :param username: The username to refresh the data for
+        :param track: Tracks changes even if no listeners are registered
+        :return: The changes of the list, empty if changes are not tracked
+        """
+        track = track or len(Cache.user_list_listeners) > 0
+        previous = None
+        if track:
+            previous = Cache.in_memory["user_indexes"].get(username)
+            if previous is None:
+                previous = {
+                    entry.id: entry for entry
+                    in self.__parse_user_entries(username)
+                }
+
+        url = Cache.base_url + "/malappinfo.php?" \
+                               "type=anime&status=all&u=" + username
+        if not self.__refresh_entry(url, "users", username):
+            return []
+
+        Cache.in_memory["users"].pop(username, None)
+        Cache.in_memory["user_indexes"].pop(username, None)
+        if previous is None:
+            return []
+
+        index = {
+            entry.id: entry for entry in self.__parse_user_entries(username)
+        }
+        Cache.in_memory["user_indexes"].put(username, index)
+
+        changes = UserListChange.diff(previous, index)
+        Metrics.increment("user_list_changes_total", len(changes))
+        for listener in Cache.user_list_listeners:
+            listener(username, changes)
+        return changes
+
+    def iter_user_entries(self, username: str) -> Iterator[UserAnimeEntry]:
+        """
+        Parses a user's XML data incrementally, without building a tree
+        of the entire document. Only one entry is held in memory at a time.
+        :param username: The username to fetch the data for
+        :return: An iterator over the entries of the user's anime list
+        """
+        self.refresh_user_xml(username)
+        return self.__parse_user_entries(username)
+
+    def __parse_user_entries(self, username: str) \
+            -> Iterator[UserAnimeEntry]:
+        """
+        Parses a user's XML data stored in the disk cache incrementally
+        :param username: The username to parse the data for
+        :return: An iterator over the entries of the user's anime list,
+                 empty if no data is stored
+        """
+        root = None
+        stream = Cache.store.open("users", username)
+        if stream is None:
+            return
+        from xml.etree import ElementTree
+        with stream:
+            for event, element in ElementTree.iterparse(
+                    stream, events=("start", "end")
+            ):
+                if root is None:
+                    root = element
+                elif event == "end" and element.tag == "anime":
+                    yield UserAnimeEntry.from_xml(element)
+                    root.clear()
+
+    def load_user_index(self, username: str) -> Dict[int, UserAnimeEntry]:
+        """
+        Loads the entries of a user's anime list, indexed by their IDs.
+        The index is built once per loaded XML document. If
+        stream_user_xml is enabled, the XML document is parsed
+        incrementally instead of being loaded as a whole.
+        :param username: The username to fetch the data for
+        :return: The entries of the user's list, indexed by their MAL IDs
+        """
+        index = Cache.in_memory["user_indexes"].get(username)
+        if index is None:
+            Metrics.increment("cache_misses_total", layer="memory",
+                              namespace="user_indexes")
+            if Cache.stream_user_xml:
+                entries = self.iter_user_entries(username)
             else:
-                with open(user_cache_file, "r") as f:
-                    data = f.read()
+                entries = (
+                    UserAnimeEntry.from_xml(series) for series
+                    in self.load_user_xml(username).find_all("anime")
+                )
+            with Metrics.timer("parse_seconds", document="user_indexes"):
+                index = {entry.id: entry for entry in entries}
+            Cache.in_memory["user_indexes"].put(username, index)
+        else:
+            Metrics.increment("cache_hits_total", layer="memory",
+                              namespace="user_indexes")
+        return index
 
-            generated = BeautifulSoup(data, features="xml")
-            Cache.in_memory["users"][username] = generated
-            return generated
+    async def load_user_xmls(self, usernames: List[str],
+                             concurrency: int = 8) -> List["BeautifulSoup"]:
+        """
+        Loads the XML data of multiple users concurrently
+        :param usernames: The usernames to fetch the data for
+        :param concurrency: The maximum amount of concurrent fetches
+        :return: The XML user data, in the same order as the usernames
+        """
+        return await self.run_bounded(self.load_user_xml, usernames,
+                                      concurrency)
 
     @staticmethod
-    def _needs_refresh(file_path: str) -> float:
+    async def run_bounded(function: Callable, arguments: List,
+                          concurrency: int) -> List:
+        """
+        Calls a blocking function for each argument in a thread pool,
+        which keeps network I/O and parsing off the event loop.
+        Duplicate arguments are only processed once.
+        :param function: The function to call
+        :param arguments: The arguments to call the function with
+        :param concurrency: The maximum amount of concurrent calls
+        :return: The results, in the same order as the arguments
+        """
+        import asyncio
+        loop = asyncio.get_event_loop()
+        unique = list(OrderedDict.fromkeys(arguments))
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = await asyncio.gather(*[
+                loop.run_in_executor(executor, function, argument)
+                for argument in unique
+            ])
+
+        mapped = dict(zip(unique, results))
+        return [mapped[argument] for argument in arguments]
+
+    def __revalidate(self, key: Tuple[str, int or str],
+                     refresh: Callable[[], None]):
         """
-        Checks if a cache file needs to be updated
-        :param file_path: The path to the file to check
-        :return: The timestamp at which the file was last modified
+        Refreshes an expired cache entry. If stale_while_revalidate is
+        enabled and the entry exists, the refresh is executed in the
+        background, allowing the caller to use the stale entry right away.
+        :param key: The namespace and key of the entry
+        :param refresh: The function that refreshes the entry
+        :return: None
         """
-        if os.path.isfile(file_path):
-            age = os.stat(file_path).st_mtime
-            return time.time() - age > Cache.flush_time
+        def locked_refresh():
+            Cache.single_flight.run(
+                ("refresh",) + key, refresh,
+                lambda: not self._needs_refresh(*key), interprocess=True
+            )
+
+        if not Cache.stale_while_revalidate \
+                or Cache.store.mtime(*key) is None:
+            locked_refresh()
         else:
+            Cache.__in_background(key, locked_refresh)
+
+    @staticmethod
+    def __in_background(key: Tuple[str, int or str],
+                        refresh: Callable[[], None]):
+        """
+        Executes the refresh of an entry in the background, unless the
+        entry is already being refreshed in the background
+        :param key: The namespace and key of the entry
+        :param refresh: The function that refreshes the entry
+        :return: None
+        """
+        with Cache.background_lock:
+            if key in Cache.background_refreshes:
+                return
+            Cache.background_refreshes.add(key)
+            if Cache.background_executor is None:
+                Cache.background_executor = ThreadPoolExecutor(max_workers=4)
+
+        def run():
+            try:
+                refresh()
+            finally:
+                with Cache.background_lock:
+                    Cache.background_refreshes.discard(key)
+
+        Cache.background_executor.submit(run)
+
+    def __refresh_entry(self, url: str, namespace: str,
+                        key: int or str) -> bool:
+        """
+        Downloads data into the disk cache. If validators (ETag or
+        Last-Modified) of the cached data are known, a conditional request
+        is sent and an unchanged entry is only marked as fresh.
+        :param url: The URL from which to fetch the data
+        :param namespace: The namespace of the entry
+        :param key: The ID or username of the entry
+        :return: True if the data changed, False otherwise
+        """
+        validator_namespace = namespace + "_validators"
+        cached = Cache.store.read(namespace, key)
+
+        headers = {}
+        validators = Cache.store.read(validator_namespace, key)
+        if cached is not None and validators is not None:
+            validators = json.loads(validators)
+            if validators.get("etag") is not None:
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified") is not None:
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = self._fetch(url, headers)
+
+        changed = response.status_code != 304 and cached != response.text
+        Metrics.increment("revalidations_total", namespace=namespace,
+                          result="changed" if changed else "unchanged")
+        if changed:
+            Cache.store.write(namespace, key, response.text)
+            self.__index(namespace, key)
+        else:
+            Cache.store.touch(namespace, key)
+
+        etag = response.header("ETag")
+        last_modified = response.header("Last-Modified")
+        if response.status_code == 304:
+            pass
+        elif etag is None and last_modified is None:
+            Cache.store.delete(validator_namespace, key)
+        else:
+            Cache.store.write(validator_namespace, key, json.dumps({
+                "etag": etag, "last_modified": last_modified
+            }))
+
+        return changed
+
+    @staticmethod
+    def _needs_refresh(namespace: str, key: int or str) -> bool:
+        """
+        Checks if a cache entry needs to be updated. The time to live of
+        anime and manga pages depends on the airing status stored in
+        their records, if they were extracted already.
+        :param namespace: The namespace of the entry
+        :param key: The ID or username of the entry
+        :return: True if the entry is missing or expired, False otherwise
+        """
+        mtime = Cache.store.mtime(namespace, key)
+        if mtime is None:
             return True
 
+        status = Cache.__stored_status(namespace, key)
+        return time.time() - mtime > Cache._ttl(namespace, key, mtime, status)
+
+    def expired_keys(self, namespace: str) -> Set[int or str]:
+        """
+        Finds all expired entries of a namespace in the disk cache. The
+        store is queried once for the entries that are older than the
+        shortest possible time to live, then the time to live of each of
+        those entries is checked.
+        :param namespace: The namespace, for example "anime" or "users"
+        :return: The IDs of the anime/manga or the usernames
+                 of the expired entries
+        """
+        shortest = min([Cache.flush_time] +
+                       list(Cache.ttls.get(namespace, {}).values()))
+        candidates = Cache.store.expired_keys(
+            namespace, shortest * (1 - Cache.ttl_jitter)
+        )
+
+        now = time.time()
+        expired = set()
+        for key, mtime in candidates.items():
+            if namespace != "users":
+                key = int(key)
+            status = Cache.__stored_status(namespace, key)
+            if now - mtime > Cache._ttl(namespace, key, mtime, status):
+                expired.add(key)
+        return expired
+
+    @staticmethod
+    def __stored_status(namespace: str, key: int or str) -> str or None:
+        """
+        Retrieves the airing status of a cached anime or manga page from
+        its record, if it was extracted already
+        :param namespace: The namespace of the entry
+        :param key: The ID or username of the entry
+        :return: The airing status, None if it is not known
+        """
+        if namespace not in Cache.ttls:
+            return None
+
+        records = namespace + "_records"
+        record = Cache.in_memory[records].get(key)
+        if record is None:
+            try:
+                record = json.loads(Cache.store.read(records, key))
+            except (TypeError, ValueError):
+                return None
+        return record["fields"]["airing_status"]
+
+    @staticmethod
+    def _ttl(namespace: str, key: int or str, mtime: float,
+             status: str = None) -> float:
+        """
+        Calculates the time to live of a cache entry. The time to live is
+        varied by up to ttl_jitter, depending on the entry and the time
+        it was stored, so that it stays the same until the entry is
+        refreshed.
+        :param namespace: The namespace of the entry
+        :param key: The ID or username of the entry
+        :param mtime: The time the entry was stored
+        :param status: The airing status of an anime or manga page
+        :return: The time to live in seconds
+        """
+        ttl = Cache.ttls.get(namespace, {}).get(status, Cache.flush_time)
+        if Cache.ttl_jitter > 0:
+            seed = namespace + ":" + str(key) + ":" + str(int(mtime))
+            spread = zlib.crc32(seed.encode("utf-8")) / 2 ** 32
+            ttl *= 1 + Cache.ttl_jitter * (2 * spread - 1)
+        return ttl
+
+    @staticmethod
+    def configure_memory(namespace: str, max_entries: int = None,
+                         max_bytes: int = None):
+        """
+        Changes the limits of an in-memory cache namespace
+        :param namespace: The namespace, for example "anime" or "users"
+        :param max_entries: The maximum amount of entries, None for no limit
+        :param max_bytes: The maximum approximate size of all entries
+                          in bytes, None for no limit
+        :return: None
+        """
+        Cache.in_memory[namespace].resize(max_entries, max_bytes)
+
+    @staticmethod
+    def memory_stats() -> Dict[str, Dict[str, int]]:
+        """
+        Generates statistics about the in-memory cache
+        :return: The entry counts, sizes and hit, miss and eviction
+                 counters of each namespace
+        """
+        return {
+            namespace: cache.stats()
+            for namespace, cache in Cache.in_memory.items()
+        }
+
+    @staticmethod
+    def __estimate_size(record: Dict[str, object]) -> int:
+        """
+        Estimates the memory used by a record
+        :param record: The record
+        :return: The approximate size in bytes
+        """
+        fields = record["fields"]
+        related = len(fields["related_anime"]) + len(fields["related_manga"])
+        return 600 + 2 * len(fields["name"] or "") + 32 * related
+
+    @staticmethod
+    def set_transport(transport: Transport, base_url: str = None):
+        """
+        Replaces the transport used to fetch data. The previous transport
+        is closed.
+        :param transport: The new transport
+        :param base_url: Optionally replaces the base URL as well
+        :return: None
+        """
+        Cache.transport.close()
+        Cache.transport = transport
+        if base_url is not None:
+            Cache.base_url = base_url
+
     @staticmethod
     def _get_url_data(url: str) -> str:
         """
-        Retrieves the data from the URL while circumventing rate limiting
+        Retrieves the data from the URL while respecting rate limiting
         :param url: The URL from which to fetch data
         :return: The retrieved HTML text
+        :raises NotFoundError: If the page does not exist
+        :raises RetryLimitExceededError: If the request kept failing
         """
-        sleeper = 1
-        response = requests.get(url)
+        return Cache._fetch(url).text
 
-        while response.status_code != 200:  # Circumvent rate limiting
+    @staticmethod
+    def _fetch(url: str, headers: Dict[str, str] = None) -> HttpResponse:
+        """
+        Executes a request while respecting rate limiting.
+        Failed requests are retried using exponential backoff with jitter,
+        honouring any Retry-After headers sent by the server.
+        :param url: The URL from which to fetch data
+        :param headers: Additional request headers
+        :return: The response. Either successful or 304 Not Modified
+        :raises NotFoundError: If the page does not exist
+        :raises RetryLimitExceededError: If the request kept failing
+        """
+        attempt = 0
+        while True:
+            waited = Cache.rate_limiter.acquire()
+            Metrics.increment("network_sleep_seconds_total", waited,
+                              reason="rate_limit")
+            try:
+                with Metrics.timer("network_request_seconds"):
+                    response = Cache.transport.get(url, headers)
+            except IOError:  # Connection problems are retried as well
+                response = None
+
+            status = None if response is None else response.status_code
+            Metrics.increment("network_requests_total", status=str(status))
+            if response is not None:
+                Metrics.increment("network_bytes_total", len(response.text))
 
-            print(response.status_code)
+            if status == 200 or status == 304:
+                return response
+            elif status == 404:
+                raise NotFoundError(url, status)
 
-            time.sleep(sleeper)
-            sleeper += 1
-            response = requests.get(url)
+            attempt += 1
+            if attempt > Cache.max_retries:
+                raise RetryLimitExceededError(url, status)
 
-            if sleeper > 30:
-                print("Timeout: " + url)
-                sys.exit(1)
+            delay = random.uniform(0, min(
+                Cache.backoff_cap, Cache.backoff_base * 2 ** attempt
+            ))
+            retry_after = Cache._parse_retry_after(response)
+            if retry_after is not None:
+                delay = retry_after
+                Cache.rate_limiter.penalize(delay)
+            elif status == 429:
+                Cache.rate_limiter.penalize(delay)
+
+            Metrics.increment("network_retries_total")
+            Metrics.increment("network_sleep_seconds_total", delay,
+                              reason="backoff")
+            time.sleep(delay)
+
+    @staticmethod
+    def _parse_retry_after(response: HttpResponse or None) -> float or None:
+        """
+        Parses the Retry-After header of a response
+        :param response: The response to check
+        :return: The amount of seconds to wait,
+                 None if the header was not sent or is invalid
+        """
+        value = None if response is None else response.header("Retry-After")
+        if value is None:
+            return None
 
-        return response.text
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                from email.utils import parsedate_to_datetime
+                retry_time = parsedate_to_datetime(value).timestamp()
+                return max(0.0, retry_time - time.time())
+            except (TypeError, ValueError):
+                return None
+
+
+def _init_worker(settings: bytes):
+    """
+    Applies the configuration of the parent process to a worker process.
+    The configuration is always sent pickled, so workers do not depend on
+    the state inherited when forking, which is not available when using
+    the spawn or forkserver start methods. Stores, locks and pooled
+    connections of the parent process are never reused.
+    :param settings: The pickled values of the class attributes listed in
+                     Cache.worker_settings, as well as the rate, burst
+                     and state file of the rate limiter
+    :return: None
+    """
+    settings = pickle.loads(settings)
+    rate, burst, state_file = settings.pop("rate_limiter")
+    for name, value in settings.items():
+        setattr(Cache, name, value)
+
+    Cache.rate_limiter = RateLimiter(rate, burst, state_file)
+    Cache.store = None
+    Cache.single_flight = None
+    Cache.disk_index = None
+    Cache.shared_instance = None
+    Cache.migrated = True
+    Cache.initialized = True
+    Cache.ready = False
+    for cache in Cache.in_memory.values():
+        cache.clear()
+
+
+def _load_record(job: Tuple[int, MediaType]) -> Dict[str, object]:
+    """
+    Loads the record of a page. Used by the worker processes that
+    preload the cache.
+    :param job: The ID and media type of the page
+    :return: The record, including its version and timestamp
+    """
+    mal_id, media_type = job
+    Cache.shared().load_mal_record(mal_id, media_type)
+    Cache.in_memory[media_type.value].pop(mal_id, None)
+    return Cache.in_memory[media_type.value + "_records"].get(mal_id)
@@ -0,0 +1,280 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import sys
+import time
+import argparse
+from typing import IO, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, \
+    FIRST_COMPLETED
+from malscraper.Cache import Cache
+from malscraper.types.MediaType import MediaType
+from malscraper.exceptions.NotFoundError import NotFoundError
+
+
+class CacheWarmer(object):
+    """
+    Class that loads many anime, manga and user lists into the disk cache
+    in parallel. Entries that are still fresh are skipped and completed
+    entries are recorded in a checkpoint file, which allows an
+    interrupted run to be resumed.
+    """
+
+    def __init__(self, concurrency: int = 8, checkpoint: str = None,
+                 progress: IO = None):
+        """
+        Initializes the cache warmer
+        :param concurrency: The maximum amount of concurrently loaded
+                            entries. Requests are still subject to the
+                            rate limiter of the cache
+        :param checkpoint: The file in which completed entries are recorded
+        :param progress: The stream to which progress is reported,
+                         None to disable progress reports
+        """
+        self.concurrency = concurrency
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.failures = []  # type: List[Tuple[Tuple[str, int or str], str]]
+
+    @staticmethod
+    def parse_entry(line: str, default_type: MediaType) \
+            -> Tuple[str, int or str] or None:
+        """
+        Parses an entry of the input. Entries can be prefixed with
+        "anime:", "manga:" or "user:". Unprefixed numbers are IDs of the
+        default media type, anything else is a username.
+        :param line: The line to parse
+        :param default_type: The media type of unprefixed IDs
+        :return: The namespace and the key of the entry,
+                 None if the line is empty
+        :raises ValueError: If a prefixed ID is not a number
+        """
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            return None
+
+        prefix, _, value = line.partition(":")
+        if value != "" and prefix in ["anime", "manga"]:
+            return prefix, int(value)
+        elif value != "" and prefix in ["user", "users"]:
+            return "users", value
+        elif line.isdigit():
+            return default_type.value, int(line)
+        else:
+            return "users", line
+
+    def warm(self, entries: List[Tuple[str, int or str]]) -> bool:
+        """
+        Loads the entries into the cache. The expired entries of each
+        namespace are looked up in bulk. Only a few more entries than
+        the concurrency are submitted at a time, so an interrupted run
+        stops quickly. The checkpoint file is removed once the run
+        completes, afterwards only expired entries are loaded again.
+        :param entries: The namespaces and keys of the entries
+        :return: True if all entries were loaded successfully. Entries
+                 that failed are listed in failures with their errors
+        """
+        cache = Cache.shared()
+        fresh = {}
+        for namespace in set(namespace for namespace, _ in entries):
+            fresh[namespace] = cache.cached_ids(namespace) - \
+                cache.expired_keys(namespace)
+
+        done = self.__load_checkpoint()
+        pending = []
+        for entry in entries:
+            encoded = self.__encode(entry)
+            if encoded in done or entry[1] in fresh[entry[0]]:
+                self.skipped += 1
+            else:
+                done.add(encoded)
+                pending.append(entry)
+
+        total = len(pending)
+        start = time.time()
+        checkpoint = None
+        if self.checkpoint is not None:
+            checkpoint = open(self.checkpoint, "a")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                remaining = iter(pending)
+                futures = {}
+                while True:
+                    while len(futures) < 2 * self.concurrency:
+                        entry = next(remaining, None)
+                        if entry is None:
+                            break
+                        futures[executor.submit(self.__load, entry)] = entry
+                    if len(futures) == 0:
+                        break
+
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        entry = futures.pop(future)
+                        try:
+                            future.result()
+                        except Exception as e:
+                            self.failed += 1
+                            self.failures.append(
+                                (entry, type(e).__name__ + ": " + str(e))
+                            )
+                        else:
+                            self.completed += 1
+                            if checkpoint is not None:
+                                checkpoint.write(self.__encode(entry) + "\n")
+                                checkpoint.flush()
+                        self.__report(total, start)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            if self.progress is not None:
+                self.progress.write("\n")
+
+        if self.checkpoint is not None and os.path.isfile(self.checkpoint):
+            os.remove(self.checkpoint)
+        return self.failed == 0
+
+    @staticmethod
+    def __load(entry: Tuple[str, int or str]):
+        """
+        Loads an entry into the cache. Entries that do not exist are
+        ignored, any other error is raised
+        :param entry: The namespace and key of the entry
+        :return: None
+        """
+        namespace, key = entry
+        try:
+            if namespace == "users":
+                Cache.shared().refresh_user_xml(key)
+            else:
+                Cache.shared().load_mal_record(key, MediaType(namespace))
+        except NotFoundError:
+            pass
+
+    def __report(self, total: int, start: float):
+        """
+        Reports the progress, the throughput and the estimated remaining
+        time of the run
+        :param total: The amount of entries to load
+        :param start: The time at which loading started
+        :return: None
+        """
+        if self.progress is None:
+            return
+
+        processed = self.completed + self.failed
+        elapsed = max(time.time() - start, 1e-6)
+        throughput = processed / elapsed
+        remaining = (total - processed) / throughput if throughput > 0 else 0
+        self.progress.write(
+            "\r" + str(processed) + "/" + str(total) + " loaded, " +
+            str(self.skipped) + " skipped, " + str(self.failed) +
+            " failed, " + "%.2f" % throughput + "/s, ETA " +
+            time.strftime("%H:%M:%S", time.gmtime(remaining))
+        )
+        self.progress.flush()
+
+    def __load_checkpoint(self) -> set:
+        """
+        Reads the entries completed by previous runs
+        :return: The encoded completed entries
+        """
+        if self.checkpoint is None or not os.path.isfile(self.checkpoint):
+            return set()
+        with open(self.checkpoint, "r") as f:
+            return set(line.strip() for line in f if line.strip() != "")
+
+    @staticmethod
+    def __encode(entry: Tuple[str, int or str]) -> str:
+        """
+        Encodes an entry for the checkpoint file
+        :param entry: The namespace and key of the entry
+        :return: The encoded entry
+        """
+        return entry[0] + ":" + str(entry[1])
+
+
+def main():
+    """
+    Entry point of the malscraper-warm command
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description="Loads anime, manga and user lists into the "
+                    "malscraper cache"
+    )
+    parser.add_argument("input", nargs="?", default="-",
+                        help="A file containing one ID or username per "
+                             "line. Reads from stdin if omitted")
+    parser.add_argument("--type", default="anime",
+                        choices=["anime", "manga"],
+                        help="The media type of unprefixed IDs")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="The amount of entries loaded in parallel")
+    parser.add_argument("--rate", type=float,
+                        help="The maximum amount of requests per second")
+    parser.add_argument("--checkpoint",
+                        help="The file recording completed entries. "
+                             "Defaults to <input>.progress for files")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Disables progress reports")
+    args = parser.parse_args()
+
+    checkpoint = args.checkpoint
+    if args.input == "-":
+        lines = sys.stdin.readlines()
+    else:
+        with open(args.input, "r") as f:
+            lines = f.readlines()
+        if checkpoint is None:
+            checkpoint = args.input + ".progress"
+
+    Cache.shared()
+    if args.rate is not None:
+        Cache.rate_limiter.rate = args.rate
+
+    entries = []
+    invalid = 0
+    for number, line in enumerate(lines, 1):
+        try:
+            entry = CacheWarmer.parse_entry(line, MediaType(args.type))
+        except ValueError:
+            sys.stderr.write("Skipping invalid entry on line " +
+                             str(number) + ": " + line.strip() + "\n")
+            invalid += 1
+            continue
+        if entry is not None:
+            entries.append(entry)
+
+    warmer = CacheWarmer(args.concurrency, checkpoint,
+                         None if args.quiet else sys.stderr)
+    success = warmer.warm(entries)
+    for entry, error in warmer.failures:
+        sys.stderr.write("Failed to load " + entry[0] + ":" +
+                         str(entry[1]) + ": " + error + "\n")
+    sys.exit(0 if success and invalid == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
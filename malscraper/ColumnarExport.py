@@ -0,0 +1,162 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from array import array
+from datetime import datetime
+from typing import Dict, List
+from malscraper.Cache import Cache
+
+
+class ColumnarExport(object):
+    """
+    Class that exports the anime lists of many users into columnar arrays,
+    which allows computing statistics over all entries using vectorised
+    operations. NumPy and pyarrow are optional dependencies that are only
+    imported when exporting to their formats.
+
+    Every entry consists of the columns user (the position of the user in
+    the list of exported usernames), id, watch_status (the numeric value
+    of the WatchState), episodes_watched, start_date and finish_date.
+    Dates are stored as days since 1970-01-01.
+    """
+
+    columns = [
+        ("user", "i", "int32"),
+        ("id", "i", "int32"),
+        ("watch_status", "b", "int8"),
+        ("episodes_watched", "i", "int32"),
+        ("start_date", "i", "int32"),
+        ("finish_date", "i", "int32")
+    ]
+    """
+    The names of the columns, their array type codes and their NumPy types
+    """
+
+    missing_date = -2 ** 31
+    """
+    The value of missing dates in the NumPy export
+    """
+
+    epoch = datetime(1970, 1, 1)
+    """
+    The date from which the days of dates are counted
+    """
+
+    @staticmethod
+    def collect(usernames: List[str]) -> Dict[str, array]:
+        """
+        Collects the entries of the users' lists into compact arrays.
+        The lists are parsed incrementally, refreshing them if necessary.
+        :param usernames: The usernames of the users
+        :return: The columns, indexed by their names
+        """
+        columns = {
+            name: array(code) for name, code, _ in ColumnarExport.columns
+        }
+        cache = Cache.shared()
+        for position, username in enumerate(usernames):
+            for entry in cache.iter_user_entries(username):
+                columns["user"].append(position)
+                columns["id"].append(entry.id)
+                columns["watch_status"].append(entry.watch_status.value)
+                columns["episodes_watched"].append(
+                    entry.episodes_watched_count
+                )
+                columns["start_date"].append(
+                    ColumnarExport.epoch_day(entry.start_watching_date)
+                )
+                columns["finish_date"].append(
+                    ColumnarExport.epoch_day(entry.finish_watching_date)
+                )
+        return columns
+
+    @staticmethod
+    def to_numpy(usernames: List[str]):
+        """
+        Exports the users' lists into a NumPy structured array.
+        Requires NumPy to be installed.
+        :param usernames: The usernames of the users
+        :return: The structured array, containing one row per entry.
+                 Missing dates are stored as missing_date
+        """
+        import numpy
+
+        columns = ColumnarExport.collect(usernames)
+        exported = numpy.empty(len(columns["id"]), dtype=[
+            (name, dtype) for name, _, dtype in ColumnarExport.columns
+        ])
+        for name, _, dtype in ColumnarExport.columns:
+            exported[name] = numpy.frombuffer(columns[name], dtype=dtype)
+        return exported
+
+    @staticmethod
+    def to_arrow(usernames: List[str]):
+        """
+        Exports the users' lists into an Arrow table.
+        Requires pyarrow to be installed.
+        :param usernames: The usernames of the users
+        :return: The table, containing one row per entry. The user column
+                 is dictionary-encoded with the usernames and missing dates
+                 are stored as nulls
+        """
+        import numpy
+        import pyarrow
+
+        columns = ColumnarExport.collect(usernames)
+        arrays = []
+        for name, _, dtype in ColumnarExport.columns:
+            values = numpy.frombuffer(columns[name], dtype=dtype)
+            if name == "user":
+                arrays.append(pyarrow.DictionaryArray.from_arrays(
+                    pyarrow.array(values), pyarrow.array(usernames)
+                ))
+            elif name.endswith("_date"):
+                arrays.append(pyarrow.array(
+                    values, mask=values == ColumnarExport.missing_date
+                ).cast(pyarrow.date32()))
+            else:
+                arrays.append(pyarrow.array(values))
+
+        return pyarrow.Table.from_arrays(
+            arrays, names=[name for name, _, _ in ColumnarExport.columns]
+        )
+
+    @staticmethod
+    def to_parquet(usernames: List[str], path: str):
+        """
+        Exports the users' lists into a Parquet file.
+        Requires pyarrow to be installed.
+        :param usernames: The usernames of the users
+        :param path: The path of the Parquet file
+        :return: None
+        """
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(ColumnarExport.to_arrow(usernames), path)
+
+    @staticmethod
+    def epoch_day(date: datetime or None) -> int:
+        """
+        Converts a date into the amount of days since 1970-01-01
+        :param date: The date to convert
+        :return: The amount of days, missing_date if no date was provided
+        """
+        if date is None:
+            return ColumnarExport.missing_date
+        return (date - ColumnarExport.epoch).days
@@ -0,0 +1,167 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import threading
+from typing import Dict
+from collections import OrderedDict
+
+
+class LruCache(object):
+    """
+    Thread-safe in-memory cache that evicts the least recently used entries
+    once it exceeds a maximum amount of entries or approximate bytes
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        """
+        Initializes the cache
+        :param max_entries: The maximum amount of entries, None for no limit
+        :param max_bytes: The maximum approximate size of all entries
+                          in bytes, None for no limit
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: object, default: object = None) -> object:
+        """
+        Retrieves an entry and marks it as recently used
+        :param key: The key of the entry
+        :param default: The value to return if the entry does not exist
+        :return: The entry or the default value
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            else:
+                self.misses += 1
+                return default
+
+    def put(self, key: object, value: object, size: int = 0):
+        """
+        Stores an entry and evicts the least recently used entries
+        if the limits are exceeded
+        :param key: The key of the entry
+        :param value: The value to store
+        :param size: The approximate size of the value in bytes
+        :return: None
+        """
+        with self.lock:
+            self.__remove(key)
+            self.entries[key] = value
+            self.sizes[key] = size
+            self.size += size
+            self.__evict()
+
+    def pop(self, key: object, default: object = None) -> object:
+        """
+        Removes an entry
+        :param key: The key of the entry
+        :param default: The value to return if the entry does not exist
+        :return: The removed entry or the default value
+        """
+        with self.lock:
+            value = self.entries.get(key, default)
+            self.__remove(key)
+            return value
+
+    def clear(self):
+        """
+        Removes all entries
+        :return: None
+        """
+        with self.lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.size = 0
+
+    def resize(self, max_entries: int = None, max_bytes: int = None):
+        """
+        Changes the limits of the cache, evicting entries if necessary
+        :param max_entries: The maximum amount of entries, None for no limit
+        :param max_bytes: The maximum approximate size of all entries
+                          in bytes, None for no limit
+        :return: None
+        """
+        with self.lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.__evict()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Generates statistics about the usage of the cache
+        :return: The amount of entries, their approximate size and the
+                 hit, miss and eviction counters
+        """
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def __contains__(self, key: object) -> bool:
+        """
+        Checks if an entry exists without marking it as recently used
+        :param key: The key of the entry
+        :return: True if the entry exists, False otherwise
+        """
+        return key in self.entries
+
+    def __len__(self) -> int:
+        """
+        :return: The amount of entries
+        """
+        return len(self.entries)
+
+    def __remove(self, key: object):
+        """
+        Removes an entry. The lock must be held by the caller.
+        :param key: The key of the entry
+        :return: None
+        """
+        if key in self.entries:
+            del self.entries[key]
+            self.size -= self.sizes.pop(key)
+
+    def __evict(self):
+        """
+        Evicts the least recently used entries until the limits are met.
+        The lock must be held by the caller.
+        :return: None
+        """
+        while len(self.entries) > 0 and (
+                (self.max_entries is not None
+                 and len(self.entries) > self.max_entries)
+                or (self.max_bytes is not None
+                    and self.size > self.max_bytes)):
+            key = next(iter(self.entries))
+            self.__remove(key)
+            self.evictions += 1
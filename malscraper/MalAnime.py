@@ -17,80 +17,185 @@ You should have received a copy of the GNU General Public License
 along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
-from typing import List
+from typing import TYPE_CHECKING, Dict, List
 from malscraper.Cache import Cache
+from malscraper.Metrics import Metrics
 from malscraper.types.AiringState import AiringState
 from malscraper.types.MediaType import MediaType
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 
 class MalAnime(object):
     """
-    Class that models a myanimelist anime
+    Class that models a myanimelist anime.
+    Only the fields extracted from the anime's page are stored, the parsed
+    page itself is only loaded when explicitly accessed using soup.
+    The fields are loaded on first access, unless loaded eagerly.
     """
 
-    def __init__(self, mal_id: int):
+    __slots__ = ("id", "__fields", "__airing_status")
+
+    def __init__(self, mal_id: int, lazy: bool = True):
         """
         Generates a MalAnime object
         :param mal_id: The anime's ID on myanimelist.net
+        :param lazy: If True, the anime's data is only loaded once one of
+                     its fields is accessed
         """
         self.id = mal_id
-        self.soup = Cache().load_mal_page(self.id, MediaType.ANIME)
-        self.name = self.__parse_name()
-        self.related_anime = self.__parse_related("anime")
-        self.related_manga = self.__parse_related("manga")
-        self.airing_status = self.__parse_airing_status()
-        self.episode_count = self.__parse_episode_count()
+        self.__fields = None
+        self.__airing_status = None
+        if not lazy:
+            self.load()
+
+    def load(self) -> "MalAnime":
+        """
+        Loads the fields of the anime, if they were not loaded yet
+        :return: The anime itself
+        """
+        if self.__fields is None:
+            with Metrics.timer("load_seconds", model="MalAnime"):
+                self.__set_fields(
+                    Cache.shared().load_mal_record(self.id, MediaType.ANIME)
+                )
+        return self
+
+    def __set_fields(self, fields: Dict[str, object]):
+        """
+        Sets the fields of the anime
+        :param fields: The fields extracted from the anime's page
+        :return: None
+        """
+        self.__fields = fields
+        self.__airing_status = self.__parse_airing_status(
+            fields["airing_status"]
+        )
+
+    @property
+    def name(self) -> str or None:
+        """
+        :return: The name of the anime
+        """
+        return self.load().__fields["name"]
+
+    @property
+    def related_anime(self) -> List[int]:
+        """
+        :return: The IDs of the related anime. The list is a copy,
+                 changing it does not affect the cached record
+        """
+        return list(self.load().__fields["related_anime"])
+
+    @property
+    def related_manga(self) -> List[int]:
+        """
+        :return: The IDs of the related manga. The list is a copy,
+                 changing it does not affect the cached record
+        """
+        return list(self.load().__fields["related_manga"])
+
+    @property
+    def airing_status(self) -> AiringState or None:
+        """
+        :return: The airing status of the anime
+        """
+        return self.load().__airing_status
 
-    def __parse_name(self) -> str:
+    @property
+    def episode_count(self) -> int or None:
         """
-        Parses the title of the anime
-        :return: The title of the name
+        :return: The amount of episodes, None if it is not known yet
         """
-        return self.soup.select("h1")[0].text
+        return self.load().__fields["episode_count"]
 
-    def __parse_related(self, media_type: str) -> List[int]:
+    @property
+    def soup(self) -> "BeautifulSoup":
         """
-        Parses the URLs of related anime
-        :param media_type: The media type to check for (anime or manga)
-        :return: A dictionary consisting of the names and the URLS
-                 of the related series
+        The parsed myanimelist page of the anime. Only loaded on demand,
+        since all fields are extracted from the record cache
+        :return: The parsed page
         """
-        related = []
-        try:
-            table = self.soup.select(".anime_detail_related_anime")[0]
-            for entry in table.select("a"):
-                path = entry["href"]
-                mal_id = path.rsplit("/", 2)[1]
-                if path.startswith("/" + media_type + "/"):
-                    related.append(int(mal_id))
+        return Cache.shared().load_mal_page(self.id, MediaType.ANIME)
 
-        except IndexError:
-            pass
-        return related
+    @classmethod
+    async def fetch_many(cls, mal_ids: List[int], concurrency: int = 8) \
+            -> List["MalAnime"]:
+        """
+        Loads multiple anime concurrently
+        :param mal_ids: The IDs of the anime on myanimelist.net
+        :param concurrency: The maximum amount of concurrent fetches
+        :return: The generated objects, in the same order as the IDs
+        """
+        return await Cache.run_bounded(
+            lambda mal_id: cls(mal_id, lazy=False), mal_ids, concurrency
+        )
 
-    def __parse_airing_status(self) -> AiringState:
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Serializes the anime into a JSON-compatible dictionary
+        :return: The dictionary. The airing status is stored as the status
+                 string displayed on the page
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "related_anime": self.related_anime,
+            "related_manga": self.related_manga,
+            "airing_status": None if self.airing_status is None
+            else self.airing_status.value,
+            "episode_count": self.episode_count
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "MalAnime":
+        """
+        Deserializes an anime generated by to_dict without accessing
+        the cache
+        :param data: The dictionary
+        :return: The anime
+        """
+        anime = cls.__new__(cls)
+        anime.id = data["id"]
+        anime.__set_fields({
+            "name": data["name"],
+            "related_anime": list(data["related_anime"]),
+            "related_manga": list(data["related_manga"]),
+            "airing_status": data["airing_status"],
+            "episode_count": data["episode_count"]
+        })
+        return anime
+
+    @classmethod
+    def parse_many(cls, mal_ids: List[int], workers: int = None) \
+            -> List["MalAnime"]:
+        """
+        Loads multiple anime, spreading the parsing of their pages across
+        a pool of worker processes. Useful for parsing large amounts of
+        cached pages, since parsing is bound by the CPU.
+        :param mal_ids: The IDs of the anime on myanimelist.net
+        :param workers: The amount of worker processes.
+                        Defaults to the amount of CPUs
+        :return: The generated objects, in the same order as the IDs
+        """
+        records = Cache.shared().load_mal_records(
+            mal_ids, MediaType.ANIME, workers
+        )
+        generated = []
+        for mal_id in mal_ids:
+            anime = cls.__new__(cls)
+            anime.id = mal_id
+            anime.__set_fields(records[mal_id])
+            generated.append(anime)
+        return generated
+
+    @staticmethod
+    def __parse_airing_status(state: str or None) -> AiringState or None:
         """
         Parses the airing status of a series
+        :param state: The status string displayed on the page
         :return: The airing status
         """
-        state = str(self.soup)\
-            .split("Status:</span>")[1]\
-            .split("</div>")[0]\
-            .strip()
-
         for airing_type in AiringState:
             if airing_type.value == state:
                 return airing_type
-
-    def __parse_episode_count(self) -> int or None:
-        """
-        Parses the episode count of a series
-        :return: The amount of episodes or
-                 None if that information is not available
-        """
-        eps = str(self.soup).split("Episodes:</span>")[1].split("</div>")[0]\
-            .strip()
-        try:
-            return int(eps)
-        except ValueError:
-            return None
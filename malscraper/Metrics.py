@@ -0,0 +1,236 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import json
+import time
+import threading
+from typing import Callable, Dict, Tuple
+
+
+class Metrics(object):
+    """
+    Collects counters and timings of the cache, network and parsing
+    layers. Disabled by default, in which case recording a metric only
+    costs a single attribute lookup.
+    """
+
+    enabled = False
+    """
+    Whether metrics are recorded
+    """
+
+    counters = {}
+    """
+    The counters, keyed by their names and labels
+    """
+
+    timings = {}
+    """
+    The amount and sum of the timings, keyed by their names and labels
+    """
+
+    exporters = []
+    """
+    Callbacks that receive every recorded metric. They are called with
+    the kind of the metric ("counter" or "timing"), its name, its value
+    and its labels
+    """
+
+    lock = threading.Lock()
+    """
+    Lock protecting the recorded metrics
+    """
+
+    @staticmethod
+    def increment(name: str, value: float = 1, **labels: str):
+        """
+        Increments a counter
+        :param name: The name of the counter
+        :param value: The value to add
+        :param labels: Labels distinguishing the counter
+        :return: None
+        """
+        if not Metrics.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with Metrics.lock:
+            Metrics.counters[key] = Metrics.counters.get(key, 0) + value
+        for exporter in Metrics.exporters:
+            exporter("counter", name, value, labels)
+
+    @staticmethod
+    def observe(name: str, seconds: float, **labels: str):
+        """
+        Records a timing
+        :param name: The name of the timing
+        :param seconds: The measured duration in seconds
+        :param labels: Labels distinguishing the timing
+        :return: None
+        """
+        if not Metrics.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with Metrics.lock:
+            timing = Metrics.timings.setdefault(key, [0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+        for exporter in Metrics.exporters:
+            exporter("timing", name, seconds, labels)
+
+    @staticmethod
+    def timer(name: str, **labels: str) -> "Timer":
+        """
+        Creates a context manager that records the duration of its block
+        :param name: The name of the timing
+        :param labels: Labels distinguishing the timing
+        :return: The context manager
+        """
+        if not Metrics.enabled:
+            return Timer.disabled
+        return Timer(name, labels)
+
+    @staticmethod
+    def add_exporter(exporter: Callable[[str, str, float, Dict], None]):
+        """
+        Registers a callback that receives every recorded metric
+        :param exporter: The callback
+        :return: None
+        """
+        Metrics.exporters.append(exporter)
+
+    @staticmethod
+    def reset():
+        """
+        Removes all recorded metrics
+        :return: None
+        """
+        with Metrics.lock:
+            Metrics.counters.clear()
+            Metrics.timings.clear()
+
+    @staticmethod
+    def to_json() -> str:
+        """
+        Serializes the recorded metrics as JSON
+        :return: A JSON object containing a list of counters and timings
+        """
+        with Metrics.lock:
+            data = {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value
+                    in sorted(Metrics.counters.items())
+                ],
+                "timings": [
+                    {"name": name, "labels": dict(labels),
+                     "count": count, "sum": total}
+                    for (name, labels), (count, total)
+                    in sorted(Metrics.timings.items())
+                ]
+            }
+        return json.dumps(data, indent=4)
+
+    @staticmethod
+    def to_prometheus() -> str:
+        """
+        Serializes the recorded metrics in the Prometheus text format.
+        Timings are exported as summaries without quantiles.
+        :return: The metrics
+        """
+        lines = []
+        with Metrics.lock:
+            counters = sorted(Metrics.counters.items())
+            timings = sorted(Metrics.timings.items())
+
+        previous = None
+        for (name, labels), value in counters:
+            if name != previous:
+                lines.append("# TYPE malscraper_" + name + " counter")
+                previous = name
+            lines.append("malscraper_" + name + Metrics.__labels(labels) +
+                         " " + repr(float(value)))
+
+        for (name, labels), (count, total) in timings:
+            if name != previous:
+                lines.append("# TYPE malscraper_" + name + " summary")
+                previous = name
+            lines.append("malscraper_" + name + "_count" +
+                         Metrics.__labels(labels) + " " + str(count))
+            lines.append("malscraper_" + name + "_sum" +
+                         Metrics.__labels(labels) + " " + repr(total))
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def __labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+        """
+        Formats labels for the Prometheus text format
+        :param labels: The labels
+        :return: The formatted labels
+        """
+        if len(labels) == 0:
+            return ""
+        return "{" + ",".join(
+            key + '="' + str(value).replace("\\", "\\\\")
+            .replace('"', '\\"') + '"'
+            for key, value in labels
+        ) + "}"
+
+
+class Timer(object):
+    """
+    Context manager that records the duration of its block as a timing
+    """
+
+    disabled = None  # type: Timer
+    """
+    Timer that does not record anything, used while metrics are disabled
+    """
+
+    def __init__(self, name: str or None, labels: Dict[str, str]):
+        """
+        Initializes the timer
+        :param name: The name of the timing, None to disable the timer
+        :param labels: Labels distinguishing the timing
+        """
+        self.name = name
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self) -> "Timer":
+        """
+        Starts the timer
+        :return: The timer
+        """
+        if self.name is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        """
+        Records the duration of the block
+        :param args: The exception information, if any
+        :return: None
+        """
+        if self.name is not None:
+            Metrics.observe(self.name, time.perf_counter() - self.start,
+                            **self.labels)
+
+
+Timer.disabled = Timer(None, {})
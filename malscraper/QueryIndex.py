@@ -0,0 +1,281 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import re
+import bisect
+import threading
+import unicodedata
+from typing import Dict, List, Set
+from malscraper.Cache import Cache
+from malscraper.types.MediaType import MediaType
+
+
+class QueryIndex(object):
+    """
+    Class that indexes the records of cached anime or manga pages in
+    memory, allowing them to be searched by their titles and filtered by
+    their airing status, their episode counts and their relations without
+    loading every cached page. Once attached to the Cache, the index is
+    updated whenever a new record is extracted.
+    """
+
+    def __init__(self, media_type: MediaType = MediaType.ANIME):
+        """
+        Initializes an empty index
+        :param media_type: The media type of the indexed series
+        """
+        self.media_type = media_type
+        self.lock = threading.RLock()
+        self.names = {}  # type: Dict[int, str]
+        self.tokens = {}  # type: Dict[str, Set[int]]
+        self.vocabulary = []  # type: List[str]
+        self.statuses = {}  # type: Dict[str, Set[int]]
+        self.episode_counts = []  # type: List[tuple]
+        self.counts = {}  # type: Dict[int, int or None]
+        self.related = {}  # type: Dict[int, List[int]]
+        self.referenced_by = {}  # type: Dict[int, Set[int]]
+
+    @classmethod
+    def build(cls, media_type: MediaType = MediaType.ANIME,
+              attach: bool = True) -> "QueryIndex":
+        """
+        Builds an index of all cached records of a media type.
+        Pages whose records were not extracted yet are not indexed.
+        :param media_type: The media type of the indexed series
+        :param attach: Whether to keep the index updated as the Cache
+                       extracts new records
+        :return: The index
+        """
+        index = cls(media_type)
+        if attach:
+            index.attach()
+
+        cache = Cache.shared()
+        for mal_id in cache.cached_ids(media_type.value):
+            fields = cache.cached_record(mal_id, media_type)
+            if fields is not None:
+                index.add(mal_id, fields)
+        return index
+
+    def attach(self):
+        """
+        Registers the index with the Cache,
+        which updates it whenever a new record is extracted
+        :return: None
+        """
+        if self.__on_record not in Cache.record_listeners:
+            Cache.record_listeners.append(self.__on_record)
+
+    def detach(self):
+        """
+        Stops updating the index
+        :return: None
+        """
+        if self.__on_record in Cache.record_listeners:
+            Cache.record_listeners.remove(self.__on_record)
+
+    def __on_record(self, media_type: MediaType, mal_id: int,
+                    fields: Dict[str, object]):
+        """
+        Updates the index once the Cache stores a record
+        :param media_type: The media type of the record
+        :param mal_id: The ID of the anime/manga
+        :param fields: The extracted fields
+        :return: None
+        """
+        if media_type == self.media_type:
+            self.add(mal_id, fields)
+
+    def __len__(self) -> int:
+        """
+        :return: The amount of indexed series
+        """
+        return len(self.names)
+
+    def __contains__(self, mal_id: int) -> bool:
+        """
+        :param mal_id: The ID of the anime/manga
+        :return: Whether the series is indexed
+        """
+        return mal_id in self.names
+
+    def add(self, mal_id: int, fields: Dict[str, object]):
+        """
+        Adds a series to the index, replacing any previous entry
+        :param mal_id: The ID of the anime/manga
+        :param fields: The fields extracted from the series' page
+        :return: None
+        """
+        with self.lock:
+            self.remove(mal_id)
+
+            name = fields["name"] or ""
+            self.names[mal_id] = name
+            for token in set(self.normalize(name)):
+                if token not in self.tokens:
+                    self.tokens[token] = set()
+                    bisect.insort(self.vocabulary, token)
+                self.tokens[token].add(mal_id)
+
+            status = fields["airing_status"]
+            self.statuses.setdefault(status, set()).add(mal_id)
+
+            count = fields["episode_count"]
+            self.counts[mal_id] = count
+            if count is not None:
+                bisect.insort(self.episode_counts, (count, mal_id))
+
+            related = fields["related_" + self.media_type.value]
+            self.related[mal_id] = list(related)
+            for related_id in related:
+                self.referenced_by.setdefault(related_id, set()).add(mal_id)
+
+    def remove(self, mal_id: int):
+        """
+        Removes a series from the index
+        :param mal_id: The ID of the anime/manga
+        :return: None
+        """
+        with self.lock:
+            if mal_id not in self.names:
+                return
+
+            for token in set(self.normalize(self.names.pop(mal_id))):
+                self.tokens[token].discard(mal_id)
+                if len(self.tokens[token]) == 0:
+                    del self.tokens[token]
+                    position = bisect.bisect_left(self.vocabulary, token)
+                    del self.vocabulary[position]
+
+            for status in list(self.statuses):
+                self.statuses[status].discard(mal_id)
+
+            count = self.counts.pop(mal_id)
+            if count is not None:
+                position = bisect.bisect_left(self.episode_counts,
+                                              (count, mal_id))
+                del self.episode_counts[position]
+
+            for related_id in self.related.pop(mal_id):
+                self.referenced_by[related_id].discard(mal_id)
+
+    def search(self, title: str) -> List[int]:
+        """
+        Searches series by their titles. A series matches if its title
+        contains all words of the search term, ignoring capitalization,
+        accents and punctuation. The last word also matches words it is
+        a prefix of.
+        :param title: The search term
+        :return: The IDs of the matching series
+        """
+        return sorted(self.__search(title))
+
+    def query(self, title: str = None, airing_status: str = None,
+              min_episodes: int = None, max_episodes: int = None,
+              related_to: int = None) -> List[int]:
+        """
+        Finds all series matching a set of criteria
+        :param title: A search term the title has to match, see search
+        :param airing_status: The airing status of the series, as its
+                              string or as an AiringState
+        :param min_episodes: The minimum amount of episodes
+        :param max_episodes: The maximum amount of episodes
+        :param related_to: The ID of a series the series has to be
+                           related to, in either direction
+        :return: The IDs of the matching series
+        """
+        with self.lock:
+            candidates = []
+            if title is not None:
+                candidates.append(self.__search(title))
+
+            if airing_status is not None:
+                status = getattr(airing_status, "value", airing_status)
+                candidates.append(self.statuses.get(status, set()))
+
+            if min_episodes is not None or max_episodes is not None:
+                start = bisect.bisect_left(
+                    self.episode_counts, (min_episodes or 0, -1)
+                )
+                if max_episodes is None:
+                    end = len(self.episode_counts)
+                else:
+                    end = bisect.bisect_left(
+                        self.episode_counts, (max_episodes + 1, -1)
+                    )
+                candidates.append(set(
+                    mal_id for _, mal_id in self.episode_counts[start:end]
+                ))
+
+            if related_to is not None:
+                candidates.append(
+                    set(self.related.get(related_to, [])) |
+                    self.referenced_by.get(related_to, set())
+                )
+
+            if len(candidates) == 0:
+                return sorted(self.names)
+
+            candidates.sort(key=len)
+            matches = set(candidates[0])
+            for candidate in candidates[1:]:
+                matches &= candidate
+            return sorted(matches & set(self.names))
+
+    def __search(self, title: str) -> Set[int]:
+        """
+        Finds the series whose titles match a search term
+        :param title: The search term
+        :return: The IDs of the matching series
+        """
+        words = self.normalize(title)
+        if len(words) == 0:
+            return set()
+
+        with self.lock:
+            postings = [self.tokens.get(word, set()) for word in words[:-1]]
+
+            prefix = words[-1]
+            matches = set()
+            position = bisect.bisect_left(self.vocabulary, prefix)
+            while position < len(self.vocabulary) \
+                    and self.vocabulary[position].startswith(prefix):
+                matches |= self.tokens[self.vocabulary[position]]
+                position += 1
+            postings.append(matches)
+
+            postings.sort(key=len)
+            result = set(postings[0])
+            for posting in postings[1:]:
+                result &= posting
+            return result
+
+    @staticmethod
+    def normalize(title: str) -> List[str]:
+        """
+        Splits a title into normalized words, ignoring capitalization,
+        accents and punctuation
+        :param title: The title
+        :return: The words of the title
+        """
+        decomposed = unicodedata.normalize("NFKD", title.lower())
+        stripped = "".join(
+            char for char in decomposed if not unicodedata.combining(char)
+        )
+        return re.findall(r"\w+", stripped)
@@ -0,0 +1,158 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class RateLimiter(object):
+    """
+    Token bucket rate limiter that is shared by all threads of a process.
+    If a state file is provided, the bucket is shared with all other
+    processes on the same host that use the same file.
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 5,
+                 state_file: str = None):
+        """
+        Initializes the rate limiter
+        :param rate: The amount of requests per second
+        :param burst: The maximum amount of requests that may be executed
+                      without waiting
+        :param state_file: Path to a file used to share the bucket with
+                           other processes. Only supported on systems
+                           that provide fcntl
+        """
+        self.rate = rate
+        self.burst = burst
+        self.state_file = state_file if fcntl is not None else None
+        self.lock = threading.Lock()
+        self.tokens = float(burst)
+        self.updated = time.time()
+        self.blocked_until = 0.0
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request may be executed
+        :return: The time spent waiting in seconds
+        """
+        waited = 0.0
+        while True:
+            delay = self.__update(self.__take)
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, delay: float):
+        """
+        Pauses all users of the rate limiter, for example because the
+        server responded with a Retry-After header
+        :param delay: The amount of seconds to pause
+        :return: None
+        """
+        def block(now: float) -> float:
+            self.blocked_until = max(self.blocked_until, now + delay)
+            self.tokens = 0.0
+            return 0.0
+
+        self.__update(block)
+
+    def __take(self, now: float) -> float:
+        """
+        Tries to take a token from the bucket
+        :param now: The current time
+        :return: The time to wait before trying again,
+                 0 if a token was taken
+        """
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        elif self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        else:
+            return (1 - self.tokens) / self.rate
+
+    def __update(self, action) -> float:
+        """
+        Refills the bucket and executes an action on it while holding
+        the thread lock and, if used, the lock of the state file
+        :param action: The action to execute. Receives the current time
+        :return: The return value of the action
+        """
+        with self.lock:
+            if self.state_file is None:
+                self.__refill(time.time())
+                return action(time.time())
+
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                self.__read_state(fd)
+                now = time.time()
+                self.__refill(now)
+                result = action(now)
+                self.__write_state(fd)
+                return result
+            finally:
+                os.close(fd)
+
+    def __refill(self, now: float):
+        """
+        Adds the tokens accumulated since the last update to the bucket
+        :param now: The current time
+        :return: None
+        """
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(float(self.burst), self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def __read_state(self, fd: int):
+        """
+        Reads the bucket's state from the state file
+        :param fd: The file descriptor of the state file
+        :return: None
+        """
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            tokens, updated, blocked_until = \
+                os.read(fd, 128).decode().split()
+            self.tokens = float(tokens)
+            self.updated = float(updated)
+            self.blocked_until = float(blocked_until)
+        except ValueError:  # New or corrupted file, keep the local state
+            pass
+
+    def __write_state(self, fd: int):
+        """
+        Writes the bucket's state to the state file
+        :param fd: The file descriptor of the state file
+        :return: None
+        """
+        state = "{} {} {}".format(self.tokens, self.updated,
+                                  self.blocked_until)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, state.encode())
@@ -0,0 +1,158 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import json
+import tempfile
+from collections import deque
+from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from malscraper.Cache import Cache
+from malscraper.RelationGraph import RelationGraph
+from malscraper.types.MediaType import MediaType
+from malscraper.exceptions.NotFoundError import NotFoundError
+
+
+class RelatedCrawler(object):
+    """
+    Class that crawls the relations between anime and manga breadth-first,
+    starting from a set of seed series. The progress of a crawl can be
+    persisted, allowing an interrupted crawl to be resumed.
+    """
+
+    def __init__(self, max_depth: int = None, max_nodes: int = None,
+                 concurrency: int = 4, state_file: str = None,
+                 media_types: List[MediaType] = None):
+        """
+        Initializes the crawler
+        :param max_depth: The maximum distance from the seeds,
+                          None for no limit
+        :param max_nodes: The maximum amount of series to load,
+                          None for no limit
+        :param concurrency: The maximum amount of concurrently loaded series
+        :param state_file: The file in which to persist the progress
+        :param media_types: The media types to follow. Defaults to both
+                            anime and manga
+        """
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.concurrency = concurrency
+        self.state_file = state_file
+        self.media_types = media_types or [MediaType.ANIME, MediaType.MANGA]
+
+    def crawl(self, seeds: List[Tuple[MediaType, int]]) -> RelationGraph:
+        """
+        Crawls the relations of the seed series. If the state file
+        contains the progress of a previous crawl, that crawl is resumed.
+        :param seeds: The media types and IDs of the seed series
+        :return: The graph of the crawled relations
+        """
+        graph, visited, frontier = self.__load_state()
+        for seed in seeds:
+            if seed not in visited:
+                visited.add(seed)
+                frontier.append((seed, 0))
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while len(frontier) > 0:
+                batch = [
+                    frontier.popleft()
+                    for _ in range(min(len(frontier), self.concurrency * 4))
+                ]
+                nodes = [node for node, _ in batch]
+                for (node, depth), related in zip(
+                        batch, executor.map(self.__load_related, nodes)
+                ):
+                    graph.add_node(*node)
+                    for target in related:
+                        graph.add_edge(node, target)
+                        if target in visited or target[0] not in \
+                                self.media_types:
+                            continue
+                        if self.max_depth is not None \
+                                and depth + 1 > self.max_depth:
+                            continue
+                        if self.max_nodes is not None \
+                                and len(visited) >= self.max_nodes:
+                            continue
+                        visited.add(target)
+                        frontier.append((target, depth + 1))
+
+                self.__save_state(graph, visited, frontier)
+
+        return graph
+
+    @staticmethod
+    def __load_related(node: Tuple[MediaType, int]) \
+            -> List[Tuple[MediaType, int]]:
+        """
+        Loads the series related to a series
+        :param node: The media type and ID of the series
+        :return: The media types and IDs of the related series
+        """
+        try:
+            fields = Cache.shared().load_mal_record(node[1], node[0])
+        except NotFoundError:
+            return []
+        return [(MediaType.ANIME, x) for x in fields["related_anime"]] + \
+               [(MediaType.MANGA, x) for x in fields["related_manga"]]
+
+    def __load_state(self) -> (RelationGraph, set, deque):
+        """
+        Loads the progress of a previous crawl from the state file
+        :return: The graph, the visited series and the frontier
+        """
+        if self.state_file is None or not os.path.isfile(self.state_file):
+            return RelationGraph(), set(), deque()
+
+        with open(self.state_file, "r") as f:
+            state = json.load(f)
+        graph = RelationGraph.from_dict(state["graph"])
+        visited = set(map(RelationGraph.decode_node, state["visited"]))
+        frontier = deque([
+            (RelationGraph.decode_node(node), depth)
+            for node, depth in state["frontier"]
+        ])
+        return graph, visited, frontier
+
+    def __save_state(self, graph: RelationGraph, visited: set,
+                     frontier: deque):
+        """
+        Atomically writes the progress of the crawl to the state file
+        :param graph: The graph crawled so far
+        :param visited: The series that were visited or queued
+        :param frontier: The queued series and their depths
+        :return: None
+        """
+        if self.state_file is None:
+            return
+
+        state = {
+            "graph": graph.to_dict(),
+            "visited": sorted(map(RelationGraph.encode_node, visited)),
+            "frontier": [
+                [RelationGraph.encode_node(node), depth]
+                for node, depth in frontier
+            ]
+        }
+        directory = os.path.dirname(os.path.abspath(self.state_file))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_file)
@@ -0,0 +1,149 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from typing import Dict, List, Tuple
+from malscraper.types.MediaType import MediaType
+
+
+class RelationGraph(object):
+    """
+    Class that models the relations between anime and manga as an
+    adjacency structure. Nodes are tuples of a media type and an ID.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty graph
+        """
+        self.adjacency = {}
+
+    def add_node(self, media_type: MediaType, mal_id: int):
+        """
+        Adds a node without any relations
+        :param media_type: The media type of the node
+        :param mal_id: The ID of the node
+        :return: None
+        """
+        self.adjacency.setdefault((media_type, mal_id), set())
+
+    def add_edge(self, source: Tuple[MediaType, int],
+                 target: Tuple[MediaType, int]):
+        """
+        Adds a relation between two nodes
+        :param source: The node whose page lists the relation
+        :param target: The related node
+        :return: None
+        """
+        self.adjacency.setdefault(source, set()).add(target)
+        self.adjacency.setdefault(target, set())
+
+    def nodes(self, media_type: MediaType = None) \
+            -> List[Tuple[MediaType, int]]:
+        """
+        Lists the nodes of the graph
+        :param media_type: Only lists nodes of this media type if provided
+        :return: The nodes
+        """
+        return [
+            node for node in self.adjacency
+            if media_type is None or node[0] == media_type
+        ]
+
+    def neighbours(self, media_type: MediaType, mal_id: int) \
+            -> List[Tuple[MediaType, int]]:
+        """
+        Lists the nodes related to a node
+        :param media_type: The media type of the node
+        :param mal_id: The ID of the node
+        :return: The related nodes
+        """
+        return sorted(self.adjacency.get((media_type, mal_id), set()),
+                      key=lambda node: (node[0].value, node[1]))
+
+    def component(self, media_type: MediaType, mal_id: int) \
+            -> List[Tuple[MediaType, int]]:
+        """
+        Finds all nodes connected to a node, ignoring the direction of the
+        relations. This corresponds to the franchise of a series.
+        :param media_type: The media type of the node
+        :param mal_id: The ID of the node
+        :return: The connected nodes, including the node itself
+        """
+        undirected = {}
+        for source, targets in self.adjacency.items():
+            for target in targets:
+                undirected.setdefault(source, set()).add(target)
+                undirected.setdefault(target, set()).add(source)
+
+        start = (media_type, mal_id)
+        found = {start}
+        queue = [start]
+        while len(queue) > 0:
+            node = queue.pop()
+            for neighbour in undirected.get(node, set()):
+                if neighbour not in found:
+                    found.add(neighbour)
+                    queue.append(neighbour)
+        return sorted(found, key=lambda node: (node[0].value, node[1]))
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """
+        Serializes the graph into a JSON-compatible dictionary
+        :return: The adjacency lists, using "<media type>:<id>" strings
+        """
+        return {
+            self.encode_node(source): sorted(
+                self.encode_node(target) for target in targets
+            )
+            for source, targets in self.adjacency.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[str]]) -> "RelationGraph":
+        """
+        Deserializes a graph generated by to_dict
+        :param data: The serialized graph
+        :return: The graph
+        """
+        graph = cls()
+        for source, targets in data.items():
+            graph.add_node(*cls.decode_node(source))
+            for target in targets:
+                graph.add_edge(cls.decode_node(source),
+                               cls.decode_node(target))
+        return graph
+
+    @staticmethod
+    def encode_node(node: Tuple[MediaType, int]) -> str:
+        """
+        Serializes a node
+        :param node: The node
+        :return: The node as a "<media type>:<id>" string
+        """
+        return node[0].value + ":" + str(node[1])
+
+    @staticmethod
+    def decode_node(node: str) -> Tuple[MediaType, int]:
+        """
+        Deserializes a node
+        :param node: The node as a "<media type>:<id>" string
+        :return: The node
+        """
+        media_type, mal_id = node.split(":")
+        return MediaType(media_type), int(mal_id)
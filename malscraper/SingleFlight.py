@@ -0,0 +1,114 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import hashlib
+import threading
+from typing import Callable
+from concurrent.futures import Future
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+class SingleFlight(object):
+    """
+    De-duplicates concurrent executions of the same operation.
+    Within a process, callers of an operation that is already running wait
+    for its result. Across processes, operations are serialized using lock
+    files, after which the operation can be skipped if another process
+    already completed it.
+    """
+
+    def __init__(self, lock_dir: str = None, stripes: int = 256):
+        """
+        Initializes the single-flight group
+        :param lock_dir: The directory containing the lock files used to
+                         coordinate with other processes. Only supported
+                         on systems that provide fcntl
+        :param stripes: The amount of lock files the keys are spread over
+        """
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self.stripes = stripes
+        self.lock = threading.Lock()
+        self.running = {}
+
+    def run(self, key: object, function: Callable[[], object],
+            done: Callable[[], bool] = None,
+            interprocess: bool = False) -> object:
+        """
+        Executes an operation unless it is already running
+        :param key: The key identifying the operation
+        :param function: The operation
+        :param done: Checks if the operation is no longer necessary, for
+                     example because another process completed it.
+                     Executed after acquiring the interprocess lock.
+        :param interprocess: Whether to coordinate with other processes
+        :return: The result of the operation, None if it was skipped
+        """
+        with self.lock:
+            future = self.running.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.running[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            if interprocess and self.lock_dir is not None:
+                result = self.__run_locked(key, function, done)
+            elif done is not None and done():
+                result = None
+            else:
+                result = function()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.running.pop(key, None)
+
+    def __run_locked(self, key: object, function: Callable[[], object],
+                     done: Callable[[], bool] or None) -> object:
+        """
+        Executes an operation while holding the lock file of its key
+        :param key: The key identifying the operation
+        :param function: The operation
+        :param done: Checks if the operation is no longer necessary
+        :return: The result of the operation, None if it was skipped
+        """
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        stripe = int(digest, 16) % self.stripes
+        os.makedirs(self.lock_dir, exist_ok=True)
+        lock_file = os.path.join(self.lock_dir, str(stripe) + ".lock")
+
+        fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if done is not None and done():
+                return None
+            return function()
+        finally:
+            os.close(fd)
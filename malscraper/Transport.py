@@ -0,0 +1,163 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import threading
+from typing import Dict, Tuple
+
+
+class HttpResponse(object):
+    """
+    Class that models a transport-independent HTTP response
+    """
+
+    def __init__(self, status_code: int, text: str,
+                 headers: Dict[str, str] = None):
+        """
+        Initializes the response
+        :param status_code: The HTTP status code
+        :param text: The decoded response body
+        :param headers: The response headers
+        """
+        self.status_code = status_code
+        self.text = text
+        self.headers = {}
+        for key, value in (headers or {}).items():
+            self.headers[key.lower()] = value
+
+    def header(self, name: str) -> str or None:
+        """
+        Retrieves a response header, ignoring the capitalization of its name
+        :param name: The name of the header
+        :return: The header's value or None if it was not sent
+        """
+        return self.headers.get(name.lower())
+
+
+class Transport(object):
+    """
+    Base class for the HTTP transports used by the Cache to fetch data.
+    Subclasses can be used to replace the network layer, for example to
+    serve recorded pages in tests and benchmarks.
+    """
+
+    def get(self, url: str, headers: Dict[str, str] = None) -> HttpResponse:
+        """
+        Executes a GET request
+        :param url: The URL to fetch
+        :param headers: Additional request headers
+        :return: The response
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        Releases any resources held by the transport
+        :return: None
+        """
+        pass
+
+
+class SessionTransport(Transport):
+    """
+    Transport that keeps connections to the server alive by using a pooled
+    requests session, avoiding a new TCP/TLS handshake for every request.
+    The session is created on first use, which avoids importing requests
+    until the first request is sent.
+    """
+
+    def __init__(self, pool_size: int = 10,
+                 timeout: Tuple[float, float] = (5.0, 30.0),
+                 headers: Dict[str, str] = None):
+        """
+        Initializes the session and its connection pool
+        :param pool_size: The maximum amount of connections kept alive
+                          per host
+        :param timeout: The connect and read timeouts in seconds
+        :param headers: Headers to send with every request
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.session = None
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, object]:
+        """
+        Allows sending the transport to worker processes. The session and
+        its pooled connections are not sent, a new session is created on
+        first use instead.
+        :return: The configuration of the transport
+        """
+        return {
+            "pool_size": self.pool_size,
+            "timeout": self.timeout,
+            "headers": self.headers
+        }
+
+    def __setstate__(self, state: Dict[str, object]):
+        """
+        Restores a transport sent to a worker process
+        :param state: The configuration of the transport
+        :return: None
+        """
+        self.__init__(**state)
+
+    def __get_session(self):
+        """
+        Creates the session and its connection pool, if necessary
+        :return: The session
+        """
+        with self.lock:
+            if self.session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers.update({"User-Agent": "malscraper"})
+                session.headers.update(self.headers)
+
+                adapter = HTTPAdapter(pool_connections=self.pool_size,
+                                      pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.session = session
+            return self.session
+
+    def get(self, url: str, headers: Dict[str, str] = None) -> HttpResponse:
+        """
+        Executes a GET request using the pooled session
+        :param url: The URL to fetch
+        :param headers: Additional request headers
+        :return: The response
+        """
+        response = self.__get_session().get(url, headers=headers,
+                                            timeout=self.timeout)
+        return HttpResponse(
+            response.status_code, response.text, dict(response.headers)
+        )
+
+    def close(self):
+        """
+        Closes all pooled connections
+        :return: None
+        """
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
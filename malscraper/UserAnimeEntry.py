@@ -0,0 +1,171 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from typing import TYPE_CHECKING, Dict, List
+from datetime import datetime
+from malscraper.types.WatchState import WatchState
+if TYPE_CHECKING:
+    from bs4.element import Tag
+    from xml.etree.ElementTree import Element
+
+
+class UserAnimeEntry(object):
+    """
+    Class that models an entry of a user's anime list
+    """
+
+    __slots__ = ("id", "title", "watch_status", "tags",
+                 "start_watching_date", "finish_watching_date",
+                 "episodes_watched_count")
+
+    def __init__(self, mal_id: int, title: str, watch_status: WatchState,
+                 tags: List[str], start_watching_date: datetime or None,
+                 finish_watching_date: datetime or None,
+                 episodes_watched_count: int):
+        """
+        Initializes the entry
+        :param mal_id: The ID of the series on MAL
+        :param title: The title of the series
+        :param watch_status: The watch status of the series
+        :param tags: The user-specified tags of the series
+        :param start_watching_date: The date the user started watching
+        :param finish_watching_date: The date the user finished watching
+        :param episodes_watched_count: The amount of watched episodes
+        """
+        self.id = mal_id
+        self.title = title
+        self.watch_status = watch_status
+        self.tags = tags
+        self.start_watching_date = start_watching_date
+        self.finish_watching_date = finish_watching_date
+        self.episodes_watched_count = episodes_watched_count
+
+    @classmethod
+    def from_xml(cls, series: "Tag" or "Element") -> "UserAnimeEntry":
+        """
+        Parses an anime entry of a user's XML data
+        :param series: The anime element of the XML data. Can be either a
+                       BeautifulSoup tag or an ElementTree element
+        :return: The parsed entry
+        """
+        return cls(
+            int(series.find("series_animedb_id").text),
+            series.find("series_title").text,
+            cls.parse_watch_status(series.find("my_status").text),
+            cls.parse_tags(series.find("my_tags").text),
+            cls.parse_date(series.find("my_start_date").text),
+            cls.parse_date(series.find("my_finish_date").text),
+            int(series.find("my_watched_episodes").text)
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Serializes the entry into a JSON-compatible dictionary
+        :return: The dictionary. The watch status is stored as its numeric
+                 value and the dates as YYYY-MM-DD strings
+        """
+        return {
+            "id": self.id,
+            "title": self.title,
+            "watch_status": self.watch_status.value,
+            "tags": list(self.tags),
+            "start_watching_date": self.format_date(self.start_watching_date),
+            "finish_watching_date":
+                self.format_date(self.finish_watching_date),
+            "episodes_watched_count": self.episodes_watched_count
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "UserAnimeEntry":
+        """
+        Deserializes an entry generated by to_dict
+        :param data: The dictionary
+        :return: The entry
+        """
+        return cls(
+            data["id"],
+            data["title"],
+            WatchState(data["watch_status"]),
+            list(data["tags"]),
+            cls.parse_date(data["start_watching_date"]),
+            cls.parse_date(data["finish_watching_date"]),
+            data["episodes_watched_count"]
+        )
+
+    @staticmethod
+    def parse_watch_status(status: str) -> WatchState:
+        """
+        Parses the watch status of a series
+        :param status: The numeric status of the series
+        :return: The watch status
+        """
+        state = int(status)
+        for enum_state in WatchState:
+            if enum_state.value == state:
+                return enum_state
+        raise ValueError("No valid state: " + str(state))
+
+    @staticmethod
+    def parse_tags(tags: str or None) -> List[str]:
+        """
+        Parses the user-specified tags of an anime. Surrounding whitespace
+        and blank tags are ignored, since parsers differ in how they
+        report empty tag lists.
+        :param tags: The comma-separated tags
+        :return: A list of tags
+        """
+        tags = [tag.strip() for tag in (tags or "").split(",")]
+        return [tag for tag in tags if tag != ""]
+
+    @staticmethod
+    def parse_date(datestring: str or None) -> datetime or None:
+        """
+        Parses a date string into a datetime object
+        :param datestring: The date string to parse
+        :return: The datetime object
+        """
+        if datestring is not None and len(datestring) == 10 \
+                and datestring[4] == "-" and datestring[7] == "-" \
+                and (datestring[:4] + datestring[5:7] +
+                     datestring[8:]).isdigit():
+            try:
+                year = int(datestring[:4])
+                month = int(datestring[5:7])
+                day = int(datestring[8:])
+                if month == 0 and day != 0:
+                    return None
+                return datetime(year, month or 1, day or 1)
+            except ValueError:
+                return None
+
+        for date_format in ["%Y-%m-%d", "%Y-%m-00", "%Y-00-00"]:
+            try:
+                return datetime.strptime(datestring, date_format)
+            except (TypeError, ValueError):
+                pass
+        return None
+
+    @staticmethod
+    def format_date(date: datetime or None) -> str or None:
+        """
+        Formats a date in the format used by the XML data
+        :param date: The date to format
+        :return: The YYYY-MM-DD string or None if no date was provided
+        """
+        return None if date is None else date.strftime("%Y-%m-%d")
@@ -0,0 +1,70 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from typing import Iterator, List
+from malscraper.Cache import Cache
+from malscraper.UserAnimeEntry import UserAnimeEntry
+from malscraper.types.WatchState import WatchState
+
+
+class UserAnimeList(object):
+    """
+    Class that models the entire anime list of a user.
+    Unlike UserMalAnime, this does not load the anime pages of the entries.
+    """
+
+    def __init__(self, username: str):
+        """
+        Loads the anime list of a user
+        :param username: The username of the user on MAL
+        """
+        self.username = username
+        self.index = Cache.shared().load_user_index(username)
+        self.entries = list(self.index.values())
+
+    def get(self, mal_id: int) -> UserAnimeEntry or None:
+        """
+        Retrieves the entry of an anime
+        :param mal_id: The ID of the series on MAL
+        :return: The entry or None if the anime is not in the list
+        """
+        return self.index.get(mal_id)
+
+    def with_status(self, watch_status: WatchState) -> List[UserAnimeEntry]:
+        """
+        Retrieves all entries with a watch status
+        :param watch_status: The watch status
+        :return: The matching entries
+        """
+        return [
+            entry for entry in self.entries
+            if entry.watch_status == watch_status
+        ]
+
+    def __iter__(self) -> Iterator[UserAnimeEntry]:
+        """
+        :return: An iterator over all entries
+        """
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        """
+        :return: The amount of entries
+        """
+        return len(self.entries)
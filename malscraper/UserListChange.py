@@ -0,0 +1,93 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from typing import Dict, List
+from malscraper.UserAnimeEntry import UserAnimeEntry
+from malscraper.types.ChangeType import ChangeType
+
+
+class UserListChange(object):
+    """
+    Class that models a change of an entry in a user's anime list
+    """
+
+    __slots__ = ("change_type", "mal_id", "old", "new", "fields")
+
+    tracked_fields = ["watch_status", "episodes_watched_count", "tags",
+                      "start_watching_date", "finish_watching_date"]
+    """
+    The fields of an entry that are compared to detect updates
+    """
+
+    def __init__(self, change_type: ChangeType, mal_id: int,
+                 old: UserAnimeEntry or None, new: UserAnimeEntry or None,
+                 fields: List[str] = None):
+        """
+        Initializes the change
+        :param change_type: The kind of change
+        :param mal_id: The ID of the changed series on MAL
+        :param old: The previous entry, None if the series was added
+        :param new: The current entry, None if the series was removed
+        :param fields: The names of the changed fields of an updated entry
+        """
+        self.change_type = change_type
+        self.mal_id = mal_id
+        self.old = old
+        self.new = new
+        self.fields = fields or []
+
+    def __repr__(self) -> str:
+        """
+        :return: A string representation of the change
+        """
+        return "UserListChange(" + self.change_type.value + ", " + \
+            str(self.mal_id) + ", " + str(self.fields) + ")"
+
+    @staticmethod
+    def diff(old: Dict[int, UserAnimeEntry],
+             new: Dict[int, UserAnimeEntry]) -> List["UserListChange"]:
+        """
+        Compares two snapshots of a user's list
+        :param old: The previous entries, indexed by their IDs
+        :param new: The current entries, indexed by their IDs
+        :return: The added, removed and updated entries, ordered by the IDs
+        """
+        changes = []
+        for mal_id in sorted(set(old) | set(new)):
+            before = old.get(mal_id)
+            after = new.get(mal_id)
+
+            if before is None:
+                changes.append(
+                    UserListChange(ChangeType.ADDED, mal_id, None, after)
+                )
+            elif after is None:
+                changes.append(
+                    UserListChange(ChangeType.REMOVED, mal_id, before, None)
+                )
+            else:
+                fields = [
+                    field for field in UserListChange.tracked_fields
+                    if getattr(before, field) != getattr(after, field)
+                ]
+                if len(fields) > 0:
+                    changes.append(UserListChange(
+                        ChangeType.UPDATED, mal_id, before, after, fields
+                    ))
+        return changes
@@ -17,106 +17,188 @@ You should have received a copy of the GNU General Public License
 along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
 LICENSE"""
 
-from typing import List
+from typing import TYPE_CHECKING, Dict, List
 from datetime import datetime
 from malscraper.Cache import Cache
+from malscraper.Metrics import Metrics
 from malscraper.MalAnime import MalAnime
+from malscraper.UserAnimeEntry import UserAnimeEntry
+from malscraper.types.MediaType import MediaType
 from malscraper.types.WatchState import WatchState
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 
 class UserMalAnime(MalAnime):
     """
     Class that extends the myanimelist Anime model
-    by integrating user-specific data
+    by integrating user-specific data.
+    Like the anime's fields, the user-specific fields are loaded on
+    first access, unless loaded eagerly.
     """
 
-    def __init__(self, mal_id: int, username: str):
+    __slots__ = ("username", "__entry")
+
+    def __init__(self, mal_id: int, username: str, lazy: bool = True):
         """
         Initializes a user-enabled MAL Anime object
         :param mal_id: The ID of the series on MAL
         :param username: The username of the user on MAL
+        :param lazy: If True, the data is only loaded once one of the
+                     fields is accessed
         """
-        super().__init__(mal_id)
         self.username = username
-        self.xml_data = Cache().load_user_xml(username)
-
-        self.user_series_data = None
-        for series in self.xml_data.find_all("anime"):
-            name = series.find_all("series_title")[0].text
-            if name == self.name:
-                self.user_series_data = series
-                break
+        self.__entry = None
+        super().__init__(mal_id, lazy)
 
-        if self.user_series_data is not None:
-            self.watch_status = self.__parse_watch_status()
-            self.tags = self.__parse_tags()
-            self.start_watching_date = self.__parse_start_watching_date()
-            self.finish_watching_date = self.__parse_finish_watching_date()
-            self.episodes_watched_count = self.__parse_episodes_watched_count()
-        else:
-            self.watch_status = WatchState.NOT_IN_LIST
-            self.tags = []
-            self.start_watching_date = None
-            self.finish_watching_date = None
-            self.episodes_watched_count = 0
+    def load(self) -> "UserMalAnime":
+        """
+        Loads the fields of the anime and the user-specific fields,
+        if they were not loaded yet
+        :return: The anime itself
+        """
+        super().load()
+        self.__load_entry()
+        return self
 
-    def __parse_watch_status(self) -> WatchState:
+    def __load_entry(self) -> UserAnimeEntry:
+        """
+        Loads the entry of the anime in the user's list, if it was not
+        loaded yet. Anime that are not in the list are represented by
+        an entry with the NOT_IN_LIST watch status.
+        :return: The entry
+        """
+        if self.__entry is None:
+            with Metrics.timer("load_seconds", model="UserMalAnime"):
+                index = Cache.shared().load_user_index(self.username)
+                entry = index.get(self.id)
+            if entry is None:
+                entry = UserAnimeEntry(
+                    self.id, None, WatchState.NOT_IN_LIST, [], None, None, 0
+                )
+            self.__entry = entry
+        return self.__entry
+
+    @property
+    def watch_status(self) -> WatchState:
         """
-        Parses the watch status of a series
-        :return: The watch status
+        :return: The watch status of the anime
         """
-        state = int(self.user_series_data.find_all("my_status")[0].text)
-        for enum_state in WatchState:
-            if enum_state.value == state:
-                return enum_state
-        raise ValueError("No valid state: " + str(state))
+        return self.__load_entry().watch_status
 
-    def __parse_tags(self) -> List[str]:
+    @property
+    def tags(self) -> List[str]:
         """
-        Parses the user-specified tags of an anime
-        :return: A list of tags
+        :return: The user-specified tags of the anime. The list is a copy,
+                 changing it does not affect the cached list
         """
-        tags = self.user_series_data.find_all("my_tags")[0].text.split(",")
-        return list(filter(lambda x: x != "", tags))
+        return list(self.__load_entry().tags)
 
-    def __parse_start_watching_date(self) -> datetime:
+    @property
+    def start_watching_date(self) -> datetime or None:
         """
-        Parses the start date of an anime watched by the user
-        :return: The start date of watching this anime
+        :return: The date the user started watching the anime
         """
-        date = self.user_series_data.find_all("my_start_date")[0].text
-        return self.__parse_date(date)
+        return self.__load_entry().start_watching_date
 
-    def __parse_finish_watching_date(self) -> datetime:
+    @property
+    def finish_watching_date(self) -> datetime or None:
         """
-        Parses the finish date of an anime watched by the user
-        :return: The finish date of watching this anime
+        :return: The date the user finished watching the anime
         """
-        date = self.user_series_data.find_all("my_finish_date")[0].text
-        return self.__parse_date(date)
+        return self.__load_entry().finish_watching_date
 
-    def __parse_episodes_watched_count(self) -> int:
+    @property
+    def episodes_watched_count(self) -> int:
         """
-        Parses the amount of watched episodes for this series
         :return: The amount of watched episodes
         """
-        return \
-            int(self.user_series_data.find_all("my_watched_episodes")[0].text)
-
-    @staticmethod
-    def __parse_date(datestring: str) -> datetime or None:
-        """
-        Parses a date string into a datetime object
-        :param datestring: The date string to parse
-        :return: The datetime object
-        """
-        try:
-            return datetime.strptime(datestring, "%Y-%m-%d")
-        except ValueError:
-            try:
-                return datetime.strptime(datestring, "%Y-%m-00")
-            except ValueError:
-                try:
-                    return datetime.strptime(datestring, "%Y-00-00")
-                except ValueError:
-                    return None
+        return self.__load_entry().episodes_watched_count
+
+    @property
+    def user_series_data(self) -> UserAnimeEntry or None:
+        """
+        The entry of the anime in the user's list. Looked up on demand
+        instead of being stored with every object
+        :return: The entry or None if the anime is not in the user's list
+        """
+        return Cache.shared().load_user_index(self.username).get(self.id)
+
+    @property
+    def xml_data(self) -> "BeautifulSoup":
+        """
+        The user's entire XML data. Only loaded on demand, since the
+        user-specific fields are read from the index of the user's list
+        :return: The XML user data
+        """
+        return Cache.shared().load_user_xml(self.username)
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Serializes the anime into a JSON-compatible dictionary
+        :return: The dictionary. The watch status is stored as its numeric
+                 value and the dates as YYYY-MM-DD strings
+        """
+        data = super().to_dict()
+        data.update({
+            "username": self.username,
+            "watch_status": self.watch_status.value,
+            "tags": self.tags,
+            "start_watching_date":
+                UserAnimeEntry.format_date(self.start_watching_date),
+            "finish_watching_date":
+                UserAnimeEntry.format_date(self.finish_watching_date),
+            "episodes_watched_count": self.episodes_watched_count
+        })
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "UserMalAnime":
+        """
+        Deserializes an anime generated by to_dict without accessing
+        the cache
+        :param data: The dictionary
+        :return: The anime
+        """
+        anime = super().from_dict(data)
+        anime.username = data["username"]
+        anime.__entry = UserAnimeEntry.from_dict({
+            "id": data["id"],
+            "title": data["name"],
+            "watch_status": data["watch_status"],
+            "tags": data["tags"],
+            "start_watching_date": data["start_watching_date"],
+            "finish_watching_date": data["finish_watching_date"],
+            "episodes_watched_count": data["episodes_watched_count"]
+        })
+        return anime
+
+    @classmethod
+    def parse_many(cls, mal_ids: List[int], username: str,
+                   workers: int = None) -> List["UserMalAnime"]:
+        """
+        Loads multiple anime of a user, spreading the parsing of their
+        pages across a pool of worker processes
+        :param mal_ids: The IDs of the anime on myanimelist.net
+        :param username: The username of the user on MAL
+        :param workers: The amount of worker processes.
+                        Defaults to the amount of CPUs
+        :return: The generated objects, in the same order as the IDs
+        """
+        Cache.shared().load_mal_records(mal_ids, MediaType.ANIME, workers)
+        return [cls(mal_id, username, lazy=False) for mal_id in mal_ids]
+
+    @classmethod
+    async def fetch_many(cls, mal_ids: List[int], username: str,
+                         concurrency: int = 8) -> List["UserMalAnime"]:
+        """
+        Loads multiple anime of a user concurrently
+        :param mal_ids: The IDs of the anime on myanimelist.net
+        :param username: The username of the user on MAL
+        :param concurrency: The maximum amount of concurrent fetches
+        :return: The generated objects, in the same order as the IDs
+        """
+        return await Cache.run_bounded(
+            lambda mal_id: cls(mal_id, username, lazy=False),
+            mal_ids, concurrency
+        )
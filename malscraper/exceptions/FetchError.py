@@ -0,0 +1,43 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+
+class FetchError(Exception):
+    """
+    Exception that is raised when data could not be fetched
+    from myanimelist.net
+    """
+
+    def __init__(self, url: str, status_code: int or None):
+        """
+        Initializes the exception
+        :param url: The URL that could not be fetched
+        :param status_code: The last HTTP status code received,
+                            None if no response was received
+        """
+        super().__init__(url, status_code)
+        self.url = url
+        self.status_code = status_code
+
+    def __str__(self) -> str:
+        """
+        :return: A message describing the failed fetch
+        """
+        return "Failed to fetch " + self.url + \
+               " (" + str(self.status_code) + ")"
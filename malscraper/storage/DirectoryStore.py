@@ -0,0 +1,228 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import gzip
+import hashlib
+import tempfile
+from typing import BinaryIO, Iterator
+from malscraper.storage.Store import Store
+
+
+class DirectoryStore(Store):
+    """
+    Stores cache entries as optionally compressed files, spread over
+    hash-sharded subdirectories of one directory per namespace.
+    Files are written atomically, so concurrent readers never see
+    partially written entries.
+    """
+
+    extensions = {None: "", "gzip": ".gz", "zstd": ".zst"}
+    """
+    The file extensions used for the supported compression codecs
+    """
+
+    def __init__(self, root: str, compression: str or None = "gzip"):
+        """
+        Initializes the store
+        :param root: The directory in which to store the entries
+        :param compression: The compression codec, either "gzip", "zstd"
+                            (requires the zstandard package) or None
+        """
+        super().__init__(compression)
+        self.root = root
+
+    def open(self, namespace: str, key: int or str) -> BinaryIO or None:
+        """
+        Opens an entry as a stream of decompressed bytes
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: The stream or None if the entry does not exist
+        """
+        path, compression = self.__find(namespace, key)
+        if path is None:
+            return None
+        elif compression == "gzip":
+            return gzip.open(path, "rb")
+        elif compression == "zstd":
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(
+                open(path, "rb"), closefd=True
+            )
+        else:
+            return open(path, "rb")
+
+    def write(self, namespace: str, key: int or str, data: str):
+        """
+        Writes an entry atomically by writing to a temporary file
+        that then replaces the entry
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :param data: The data to store
+        :return: None
+        """
+        encoded = self.compress(data)
+        path = self.path(namespace, key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encoded)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        for compression in self.extensions:
+            if compression != self.compression:
+                self.__remove(self.path(namespace, key, compression))
+
+    def mtime(self, namespace: str, key: int or str) -> float or None:
+        """
+        Retrieves the time at which an entry was last written or touched
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: The timestamp or None if the entry does not exist
+        """
+        path, _ = self.__find(namespace, key)
+        try:
+            return None if path is None else os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def touch(self, namespace: str, key: int or str):
+        """
+        Marks an entry as fresh without changing it
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: None
+        """
+        path, _ = self.__find(namespace, key)
+        if path is not None:
+            os.utime(path)
+
+    def delete(self, namespace: str, key: int or str):
+        """
+        Deletes an entry
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: None
+        """
+        for compression in self.extensions:
+            self.__remove(self.path(namespace, key, compression))
+
+    def keys(self, namespace: str) -> Iterator[str]:
+        """
+        Lists the keys of all entries in a namespace
+        :param namespace: The namespace
+        :return: An iterator over the keys
+        """
+        directory = os.path.join(self.root, namespace)
+        if not os.path.isdir(directory):
+            return
+        for shard in os.scandir(directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith("."):
+                    continue
+                key = entry.name
+                for extension in self.extensions.values():
+                    if extension != "" and key.endswith(extension):
+                        key = key[:-len(extension)]
+                yield key
+
+    def path(self, namespace: str, key: int or str,
+             compression: str or None = "default") -> str:
+        """
+        Generates the path of an entry
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :param compression: The compression codec of the file,
+                            defaults to the codec of the store
+        :return: The path
+        """
+        if compression == "default":
+            compression = self.compression
+        key = str(key)
+        shard = hashlib.sha1(key.encode("utf-8")).hexdigest()[:2]
+        return os.path.join(self.root, namespace, shard,
+                            key + self.extensions[compression])
+
+    def migrate(self, namespace: str):
+        """
+        Moves entries stored in the legacy layout, one uncompressed file
+        per entry directly inside the namespace directory, into the store.
+        The legacy files are moved aside first, since their names can be
+        the same as the names of shard directories, for example "77".
+        An interrupted migration continues on the next call.
+        The modification times of the entries are preserved.
+        :param namespace: The namespace to migrate
+        :return: None
+        """
+        directory = os.path.join(self.root, namespace)
+        legacy = os.path.join(self.root, namespace + ".legacy")
+        if os.path.isdir(directory):
+            for entry in os.scandir(directory):
+                if entry.is_file() and not entry.name.startswith("."):
+                    os.makedirs(legacy, exist_ok=True)
+                    os.rename(entry.path, os.path.join(legacy, entry.name))
+
+        if not os.path.isdir(legacy):
+            return
+        for entry in os.scandir(legacy):
+            with open(entry.path, "r") as f:
+                data = f.read()
+            mtime = entry.stat().st_mtime
+            self.write(namespace, entry.name, data)
+            os.utime(self.path(namespace, entry.name), (mtime, mtime))
+            os.remove(entry.path)
+        os.rmdir(legacy)
+
+    def __find(self, namespace: str, key: int or str) \
+            -> (str or None, str or None):
+        """
+        Finds the file of an entry. Files that were written using a
+        different compression codec than the current one are found as well.
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: The path to the file and its compression codec,
+                 (None, None) if the entry does not exist
+        """
+        codecs = [self.compression] + \
+            [x for x in self.extensions if x != self.compression]
+        for compression in codecs:
+            path = self.path(namespace, key, compression)
+            if os.path.isfile(path):
+                return path, compression
+        return None, None
+
+    @staticmethod
+    def __remove(path: str):
+        """
+        Removes a file if it exists
+        :param path: The path to the file
+        :return: None
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,202 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import io
+import os
+import gzip
+import time
+import sqlite3
+import threading
+from typing import BinaryIO, Dict, Iterator
+from malscraper.storage.Store import Store
+
+
+class SqliteStore(Store):
+    """
+    Stores all cache entries in a single SQLite database in WAL mode,
+    which allows multiple processes to read and write concurrently.
+    Entries are looked up by their primary key (namespace, key).
+    """
+
+    def __init__(self, path: str, compression: str or None = "gzip",
+                 timeout: float = 30.0):
+        """
+        Initializes the store and creates the database if necessary
+        :param path: The path to the database file
+        :param compression: The compression codec, either "gzip", "zstd"
+                            (requires the zstandard package) or None
+        :param timeout: The amount of seconds to wait for locks held
+                        by other connections
+        """
+        super().__init__(compression)
+        self.path = path
+        self.timeout = timeout
+        self.local = threading.local()
+
+        with self.__connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "namespace TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "compression TEXT, "
+                "data BLOB NOT NULL, "
+                "mtime REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key)"
+                ") WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_mtime "
+                "ON entries (namespace, mtime)"
+            )
+
+    def open(self, namespace: str, key: int or str) -> BinaryIO or None:
+        """
+        Opens an entry as a stream of decompressed bytes. The data is
+        decompressed while it is read, but unlike files, the compressed
+        data of the entry is loaded into memory as a whole.
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: The stream or None if the entry does not exist
+        """
+        row = self.__connection().execute(
+            "SELECT compression, data FROM entries "
+            "WHERE namespace = ? AND key = ?",
+            (namespace, str(key))
+        ).fetchone()
+        if row is None:
+            return None
+
+        compression, data = row
+        if compression == "gzip":
+            return gzip.GzipFile(fileobj=io.BytesIO(data), mode="rb")
+        elif compression == "zstd":
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(data)
+        else:
+            return io.BytesIO(data)
+
+    def write(self, namespace: str, key: int or str, data: str):
+        """
+        Writes an entry in a single transaction
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :param data: The data to store
+        :return: None
+        """
+        with self.__connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(namespace, key, compression, data, mtime) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, str(key), self.compression,
+                 self.compress(data), time.time())
+            )
+
+    def mtime(self, namespace: str, key: int or str) -> float or None:
+        """
+        Retrieves the time at which an entry was last written or touched
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: The timestamp or None if the entry does not exist
+        """
+        row = self.__connection().execute(
+            "SELECT mtime FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, str(key))
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def touch(self, namespace: str, key: int or str):
+        """
+        Marks an entry as fresh without changing it
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: None
+        """
+        with self.__connection() as connection:
+            connection.execute(
+                "UPDATE entries SET mtime = ? "
+                "WHERE namespace = ? AND key = ?",
+                (time.time(), namespace, str(key))
+            )
+
+    def delete(self, namespace: str, key: int or str):
+        """
+        Deletes an entry
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: None
+        """
+        with self.__connection() as connection:
+            connection.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, str(key))
+            )
+
+    def keys(self, namespace: str) -> Iterator[str]:
+        """
+        Lists the keys of all entries in a namespace
+        :param namespace: The namespace
+        :return: An iterator over the keys
+        """
+        rows = self.__connection().execute(
+            "SELECT key FROM entries WHERE namespace = ?", (namespace,)
+        ).fetchall()
+        return iter([row[0] for row in rows])
+
+    def expired_keys(self, namespace: str, max_age: float) \
+            -> Dict[str, float]:
+        """
+        Lists all entries in a namespace that were not written or touched
+        within a time span, using a single query on the mtime index
+        :param namespace: The namespace
+        :param max_age: The time span in seconds
+        :return: The modification times of the expired entries,
+                 indexed by their keys
+        """
+        rows = self.__connection().execute(
+            "SELECT key, mtime FROM entries WHERE namespace = ? AND mtime < ?",
+            (namespace, time.time() - max_age)
+        ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def close(self):
+        """
+        Closes the database connection of the calling thread
+        :return: None
+        """
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def __connection(self) -> sqlite3.Connection:
+        """
+        Retrieves the database connection of the calling thread,
+        since SQLite connections may not be shared between threads.
+        Connections inherited from a parent process are not reused.
+        :return: The connection
+        """
+        connection = getattr(self.local, "connection", None)
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
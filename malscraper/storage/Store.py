@@ -0,0 +1,168 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import gzip
+import time
+from typing import BinaryIO, Dict, Iterator
+
+
+class Store(object):
+    """
+    Base class for the backends that hold the disk cache. Entries are
+    addressed by a namespace (for example "anime" or "users") and a key.
+    """
+
+    codecs = [None, "gzip", "zstd"]
+    """
+    The supported compression codecs
+    """
+
+    def __init__(self, compression: str or None = "gzip"):
+        """
+        Initializes the store
+        :param compression: The compression codec, either "gzip", "zstd"
+                            (requires the zstandard package) or None
+        """
+        if compression not in self.codecs:
+            raise ValueError("Invalid compression: " + str(compression))
+        self.compression = compression
+
+    def read(self, namespace: str, key: int or str) -> str or None:
+        """
+        Reads an entry
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: The stored data or None if the entry does not exist
+        """
+        stream = self.open(namespace, key)
+        if stream is None:
+            return None
+        with stream:
+            return stream.read().decode("utf-8")
+
+    def open(self, namespace: str, key: int or str) -> BinaryIO or None:
+        """
+        Opens an entry as a stream of decompressed bytes
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: The stream or None if the entry does not exist
+        """
+        raise NotImplementedError()
+
+    def write(self, namespace: str, key: int or str, data: str):
+        """
+        Writes an entry atomically
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :param data: The data to store
+        :return: None
+        """
+        raise NotImplementedError()
+
+    def mtime(self, namespace: str, key: int or str) -> float or None:
+        """
+        Retrieves the time at which an entry was last written or touched
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: The timestamp or None if the entry does not exist
+        """
+        raise NotImplementedError()
+
+    def touch(self, namespace: str, key: int or str):
+        """
+        Marks an entry as fresh without changing it
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: None
+        """
+        raise NotImplementedError()
+
+    def delete(self, namespace: str, key: int or str):
+        """
+        Deletes an entry
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :return: None
+        """
+        raise NotImplementedError()
+
+    def keys(self, namespace: str) -> Iterator[str]:
+        """
+        Lists the keys of all entries in a namespace
+        :param namespace: The namespace
+        :return: An iterator over the keys
+        """
+        raise NotImplementedError()
+
+    def expired_keys(self, namespace: str, max_age: float) \
+            -> Dict[str, float]:
+        """
+        Lists all entries in a namespace that were not written or touched
+        within a time span. Backends that can do so answer this using a
+        single query instead of checking every entry.
+        :param namespace: The namespace
+        :param max_age: The time span in seconds
+        :return: The modification times of the expired entries,
+                 indexed by their keys
+        """
+        threshold = time.time() - max_age
+        expired = {}
+        for key in self.keys(namespace):
+            mtime = self.mtime(namespace, key)
+            if mtime is not None and mtime < threshold:
+                expired[key] = mtime
+        return expired
+
+    def close(self):
+        """
+        Releases any resources held by the store
+        :return: None
+        """
+        pass
+
+    def compress(self, data: str) -> bytes:
+        """
+        Encodes and compresses data using the store's compression codec
+        :param data: The data to compress
+        :return: The compressed data
+        """
+        encoded = data.encode("utf-8")
+        if self.compression == "gzip":
+            return gzip.compress(encoded)
+        elif self.compression == "zstd":
+            import zstandard
+            return zstandard.ZstdCompressor().compress(encoded)
+        else:
+            return encoded
+
+    @staticmethod
+    def decompress(data: bytes, compression: str or None) -> bytes:
+        """
+        Decompresses data
+        :param data: The compressed data
+        :param compression: The compression codec used for the data
+        :return: The decompressed data
+        """
+        if compression == "gzip":
+            return gzip.decompress(data)
+        elif compression == "zstd":
+            import zstandard
+            return zstandard.ZstdDecompressor().decompress(data)
+        else:
+            return data
@@ -38,6 +38,14 @@ if __name__ == "__main__":
         license="GNU GPL3",
         packages=find_packages(),
         install_requires=["bs4", "requests", "typing"],
+        extras_require={
+            "columnar": ["numpy", "pyarrow"]
+        },
         include_package_data=True,
+        entry_points={
+            "console_scripts": [
+                "malscraper-warm=malscraper.CacheWarmer:main"
+            ]
+        },
         zip_safe=False
     )
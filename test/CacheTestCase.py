@@ -0,0 +1,83 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from malscraper.Cache import Cache
+from malscraper.RateLimiter import RateLimiter
+from test.FakeTransport import FakeTransport
+
+
+class CacheTestCase(TestCase):
+    """
+    Base class for tests that use the cache. Each test uses a cache in a
+    temporary directory that is served by a FakeTransport. The home
+    directory is replaced as well, so the default cache directory of the
+    user is never accessed.
+    """
+
+    settings = ["transport", "base_url", "rate_limiter", "max_retries",
+                "backoff_base", "backoff_cap", "ttls", "ttl_jitter",
+                "refresh_ahead", "flush_time", "stale_while_revalidate",
+                "stream_user_xml", "strain_pages", "html_parser",
+                "backend", "compression"]
+    """
+    The class attributes of the cache that are restored after each test
+    """
+
+    def setUp(self):
+        """
+        Configures a cache in a temporary directory
+        :return: None
+        """
+        self.home = tempfile.mkdtemp()
+        self.previous_home = os.environ.get("HOME")
+        os.environ["HOME"] = self.home
+        self.root = os.path.join(self.home, "cache")
+        self.previous_settings = {
+            name: getattr(Cache, name) for name in self.settings
+        }
+
+        self.fake = FakeTransport()
+        Cache.configure(root=self.root)
+        Cache.set_transport(self.fake)
+        Cache.rate_limiter = RateLimiter(rate=10 ** 6, burst=10 ** 6)
+
+    def tearDown(self):
+        """
+        Restores the configuration of the cache, resets it to the default
+        cache directory and removes the temporary directories
+        :return: None
+        """
+        for name, value in self.previous_settings.items():
+            setattr(Cache, name, value)
+        Cache.configure()
+        Cache.store.close()
+
+        # The default cache directory is set up again on the next use,
+        # once the home directory was restored
+        Cache.rate_limiter = self.previous_settings["rate_limiter"]
+        Cache.store = None
+        Cache.single_flight = None
+        Cache.ready = False
+
+        os.environ["HOME"] = self.previous_home
+        shutil.rmtree(self.home)
@@ -0,0 +1,131 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import re
+import time
+import threading
+from typing import Dict, List, Set
+from malscraper.Transport import Transport, HttpResponse
+
+
+class FakeTransport(Transport):
+    """
+    Transport that generates minimal pages instead of accessing
+    myanimelist.net. Used to test the cache without network access.
+    Responses queued in responses are sent first, where exceptions are
+    raised instead, for example to simulate connection errors. Pages of
+    the IDs in airing are currently airing.
+    """
+
+    page_template = \
+        "<html><head><title>{name} - MyAnimeList.net</title></head><body>" \
+        "<div id=\"contentWrapper\"><div><h1 class=\"h1\">" \
+        "<span itemprop=\"name\">{name}</span></h1></div>" \
+        "<div id=\"content\"><table><tr><td class=\"borderClass\">" \
+        "<div class=\"js-scrollfix-bottom\"><h2>Information</h2>" \
+        "<div class=\"spaceit\"><span class=\"dark_text\">Episodes:</span>" \
+        " 12 </div><div><span class=\"dark_text\">Status:</span>" \
+        " {status} </div></div></td><td>" \
+        "<table class=\"anime_detail_related_anime\"><tr>" \
+        "<td>Sequel:</td><td><a href=\"/anime/{sequel}/Sequel\">Sequel</a>" \
+        "</td></tr></table></td></tr></table></div></div></body></html>"
+    """
+    The template used to generate anime and manga pages
+    """
+
+    def __init__(self, missing: Set[int] = None, delay: float = 0.0):
+        """
+        Initializes the transport
+        :param missing: IDs of pages that are answered with a 404 response
+        :param delay: The time each response takes in seconds
+        """
+        self.missing = missing or set()
+        self.airing = set()  # type: Set[int]
+        self.delay = delay
+        self.user_lists = {}  # type: Dict[str, str]
+        self.responses = {}  # type: Dict[str, List[object]]
+        self.requests = []  # type: List[str]
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, object]:
+        """
+        Allows sending the transport to worker processes
+        :return: The state of the transport, excluding its lock
+        """
+        state = dict(self.__dict__)
+        state.pop("lock")
+        return state
+
+    def __setstate__(self, state: Dict[str, object]):
+        """
+        Restores the transport in a worker process
+        :param state: The state of the transport
+        :return: None
+        """
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def get(self, url: str, headers: Dict[str, str] = None) -> HttpResponse:
+        """
+        Generates the response to a request
+        :param url: The requested URL
+        :param headers: Additional request headers, ignored
+        :return: The response
+        """
+        with self.lock:
+            self.requests.append(url)
+            queued = self.responses.get(url, [])
+            replies = [queued.pop(0)] if len(queued) > 0 else []
+        if self.delay > 0:
+            time.sleep(self.delay)
+
+        if len(replies) > 0:
+            if isinstance(replies[0], Exception):
+                raise replies[0]
+            return replies[0]
+
+        if "malappinfo.php" in url:
+            username = url.rsplit("=", 1)[1]
+            if username not in self.user_lists:
+                return HttpResponse(404, "")
+            return HttpResponse(200, self.user_lists[username])
+
+        mal_id = int(re.search(r"/(anime|manga)/(\d+)", url).group(2))
+        if mal_id in self.missing:
+            return HttpResponse(404, "")
+        status = "Currently Airing" if mal_id in self.airing \
+            else "Finished Airing"
+        return HttpResponse(200, self.page_template.format(
+            name="Anime " + str(mal_id), sequel=mal_id + 1, status=status
+        ))
+
+    @staticmethod
+    def user_list(entries: List[Dict[str, str]]) -> str:
+        """
+        Generates the XML list of a user
+        :param entries: The XML elements of each anime entry
+        :return: The XML data
+        """
+        xml = "<?xml version=\"1.0\" encoding=\"UTF-8\" ?><myanimelist>"
+        for entry in entries:
+            xml += "<anime>"
+            for key, value in entry.items():
+                xml += "<" + key + ">" + value + "</" + key + ">"
+            xml += "</anime>"
+        return xml + "</myanimelist>"
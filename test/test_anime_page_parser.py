@@ -0,0 +1,64 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from unittest import TestCase
+from bs4 import BeautifulSoup
+from malscraper.AnimePageParser import AnimePageParser
+from test.FakeTransport import FakeTransport
+
+
+class AnimePageParserTest(TestCase):
+    """
+    Tests extracting the fields of anime pages
+    """
+
+    def test_parsing_page(self):
+        """
+        Tests extracting the fields of a page
+        :return: None
+        """
+        page = FakeTransport.page_template.format(
+            name="Anime 1", sequel=2, status="Finished Airing"
+        )
+        fields = AnimePageParser.parse(BeautifulSoup(page, "html.parser"))
+        self.assertEqual(fields, {
+            "name": "Anime 1",
+            "related_anime": [2],
+            "related_manga": [],
+            "airing_status": "Finished Airing",
+            "episode_count": 12
+        })
+
+    def test_ignoring_other_links(self):
+        """
+        Tests that links in the table of related series that do not point
+        to an anime or manga are ignored
+        :return: None
+        """
+        page = "<table class=\"anime_detail_related_anime\"><tr><td>" \
+               "<a href=\"#\">Top</a>" \
+               "<a href=\"/anime/5/Sequel\">Sequel</a>" \
+               "<a href=\"/people/3/Author\">Author</a>" \
+               "<a href=\"/manga/abc/Broken\">Broken</a>" \
+               "<a>Missing</a>" \
+               "<a href=\"/manga/7\">Adaptation</a>" \
+               "</td></tr></table>"
+        fields = AnimePageParser.parse(BeautifulSoup(page, "html.parser"))
+        self.assertEqual(fields["related_anime"], [5])
+        self.assertEqual(fields["related_manga"], [7])
@@ -0,0 +1,100 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+from malscraper.Cache import Cache
+from malscraper.CacheWarmer import CacheWarmer
+from malscraper.types.MediaType import MediaType
+from test.CacheTestCase import CacheTestCase
+
+
+class CacheWarmerTest(CacheTestCase):
+    """
+    Tests warming the cache
+    """
+
+    def setUp(self):
+        """
+        Configures a cache whose transport does not know the anime 3
+        :return: None
+        """
+        super().setUp()
+        self.fake.missing.add(3)
+        self.checkpoint = os.path.join(self.home, "ids.txt.progress")
+
+    def test_parsing_entries(self):
+        """
+        Tests parsing the lines of the input
+        :return: None
+        """
+        self.assertEqual(CacheWarmer.parse_entry(" 1\n", MediaType.MANGA),
+                         ("manga", 1))
+        self.assertEqual(CacheWarmer.parse_entry("anime:2", MediaType.MANGA),
+                         ("anime", 2))
+        self.assertEqual(CacheWarmer.parse_entry("user:a", MediaType.ANIME),
+                         ("users", "a"))
+        self.assertIsNone(CacheWarmer.parse_entry("# a", MediaType.ANIME))
+        with self.assertRaises(ValueError):
+            CacheWarmer.parse_entry("anime:abc", MediaType.ANIME)
+
+    def test_checkpoint_removed_after_run(self):
+        """
+        Tests that a completed run skips entries recorded in the checkpoint
+        and removes the checkpoint afterwards
+        :return: None
+        """
+        with open(self.checkpoint, "w") as f:
+            f.write("anime:1\n")
+
+        entries = [("anime", mal_id) for mal_id in range(1, 11)]
+        warmer = CacheWarmer(2, self.checkpoint)
+        self.assertTrue(warmer.warm(entries))
+        self.assertEqual((warmer.completed, warmer.skipped), (9, 1))
+        self.assertNotIn("https://myanimelist.net/anime/1",
+                         self.fake.requests)
+        self.assertFalse(os.path.isfile(self.checkpoint))
+
+        warmer = CacheWarmer(2, self.checkpoint)
+        self.assertTrue(warmer.warm(entries))
+        self.assertEqual((warmer.completed, warmer.skipped), (2, 8))
+
+    def test_failures_reported(self):
+        """
+        Tests that an entry that fails to load does not stop the run
+        and is reported
+        :return: None
+        """
+        self.fake.responses["https://myanimelist.net/anime/4"] = \
+            [RuntimeError("broken")]
+        warmer = CacheWarmer(2)
+        self.assertFalse(warmer.warm([("anime", x) for x in range(1, 7)]))
+        self.assertEqual((warmer.completed, warmer.failed), (5, 1))
+        self.assertEqual(warmer.failures,
+                         [(("anime", 4), "RuntimeError: broken")])
+
+    def test_warming_without_set_up(self):
+        """
+        Tests warming the cache before the cache was set up
+        :return: None
+        """
+        Cache.store.close()
+        Cache.store = None
+        Cache.shared_instance = None
+        Cache.ready = False
+        self.assertTrue(CacheWarmer().warm([("anime", 1), ("users", "a")]))
@@ -0,0 +1,147 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import unittest
+from datetime import datetime
+from typing import Dict
+from malscraper.ColumnarExport import ColumnarExport
+from test.CacheTestCase import CacheTestCase
+from test.FakeTransport import FakeTransport
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+def entry(mal_id: int, status: int, episodes: int, start: str,
+          finish: str) -> Dict[str, str]:
+    """
+    Generates the XML elements of a list entry
+    :param mal_id: The ID of the anime
+    :param status: The numeric watch status
+    :param episodes: The amount of watched episodes
+    :param start: The start date
+    :param finish: The finish date
+    :return: The XML elements
+    """
+    return {
+        "series_animedb_id": str(mal_id),
+        "series_title": "Anime " + str(mal_id),
+        "my_watched_episodes": str(episodes),
+        "my_start_date": start,
+        "my_finish_date": finish,
+        "my_status": str(status),
+        "my_tags": "<![CDATA[]]>"
+    }
+
+
+class ColumnarExportTest(CacheTestCase):
+    """
+    Tests exporting the lists of users into columns
+    """
+
+    def setUp(self):
+        """
+        Publishes the lists of two users
+        :return: None
+        """
+        super().setUp()
+        self.fake.user_lists["first"] = FakeTransport.user_list([
+            entry(1, 2, 26, "1970-01-01", "2000-03-01"),
+            entry(2, 1, 3, "1969-12-31", "0000-00-00")
+        ])
+        self.fake.user_lists["second"] = FakeTransport.user_list([
+            entry(70000, 6, 0, "0000-00-00", "0000-00-00")
+        ])
+
+    def test_epoch_day(self):
+        """
+        Tests converting dates into days since 1970-01-01
+        :return: None
+        """
+        self.assertEqual(ColumnarExport.epoch_day(datetime(1970, 1, 1)), 0)
+        self.assertEqual(ColumnarExport.epoch_day(datetime(1969, 12, 31)),
+                         -1)
+        self.assertEqual(ColumnarExport.epoch_day(datetime(2000, 3, 1)),
+                         11017)
+        self.assertEqual(ColumnarExport.epoch_day(None),
+                         ColumnarExport.missing_date)
+
+    def test_collect(self):
+        """
+        Tests collecting the entries into arrays of the column types
+        :return: None
+        """
+        columns = ColumnarExport.collect(["first", "second"])
+        for name, code, _ in ColumnarExport.columns:
+            self.assertEqual(columns[name].typecode, code)
+
+        missing = ColumnarExport.missing_date
+        self.assertEqual(list(columns["user"]), [0, 0, 1])
+        self.assertEqual(list(columns["id"]), [1, 2, 70000])
+        self.assertEqual(list(columns["watch_status"]), [2, 1, 6])
+        self.assertEqual(list(columns["episodes_watched"]), [26, 3, 0])
+        self.assertEqual(list(columns["start_date"]), [0, -1, missing])
+        self.assertEqual(list(columns["finish_date"]),
+                         [11017, missing, missing])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy(self):
+        """
+        Tests exporting into a NumPy structured array
+        :return: None
+        """
+        exported = ColumnarExport.to_numpy(["first", "second"])
+        self.assertEqual(len(exported), 3)
+        for name, _, dtype in ColumnarExport.columns:
+            self.assertEqual(exported.dtype[name], numpy.dtype(dtype))
+        self.assertEqual(list(exported["id"]), [1, 2, 70000])
+        self.assertEqual(list(exported["finish_date"]),
+                         [11017] + [ColumnarExport.missing_date] * 2)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow(self):
+        """
+        Tests exporting into an Arrow table and a Parquet file
+        :return: None
+        """
+        table = ColumnarExport.to_arrow(["first", "second"])
+        self.assertEqual(table.column("user").to_pylist(),
+                         ["first", "first", "second"])
+        self.assertEqual(table.schema.field("watch_status").type,
+                         pyarrow.int8())
+        self.assertEqual(table.schema.field("start_date").type,
+                         pyarrow.date32())
+        self.assertEqual(
+            table.column("start_date").to_pylist(),
+            [datetime(1970, 1, 1).date(), datetime(1969, 12, 31).date(), None]
+        )
+        self.assertEqual(table.column("finish_date").null_count, 2)
+
+        path = os.path.join(self.home, "lists.parquet")
+        ColumnarExport.to_parquet(["first", "second"], path)
+        self.assertTrue(pyarrow.parquet.read_table(path).equals(table))
@@ -0,0 +1,156 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import sqlite3
+from malscraper.Cache import Cache
+from malscraper.types.MediaType import MediaType
+from malscraper.types.AiringState import AiringState
+from malscraper.storage.SqliteStore import SqliteStore
+from malscraper.storage.DirectoryStore import DirectoryStore
+from test.CacheTestCase import CacheTestCase
+
+
+class ExpiryTest(CacheTestCase):
+    """
+    Tests finding expired entries of the disk cache
+    """
+
+    def age(self, namespace: str, key: int or str, seconds: float):
+        """
+        Changes the modification time of a stored entry
+        :param namespace: The namespace of the entry
+        :param key: The key of the entry
+        :param seconds: The age of the entry in seconds
+        :return: None
+        """
+        mtime = time.time() - seconds
+        if isinstance(Cache.store, DirectoryStore):
+            path = Cache.store.path(namespace, key)
+            os.utime(path, (mtime, mtime))
+        else:
+            with sqlite3.connect(Cache.store.path) as connection:
+                connection.execute(
+                    "UPDATE entries SET mtime = ? "
+                    "WHERE namespace = ? AND key = ?",
+                    (mtime, namespace, str(key))
+                )
+
+    def test_store_expired_keys(self):
+        """
+        Tests listing expired entries using both backends
+        :return: None
+        """
+        for store in [DirectoryStore(os.path.join(self.home, "files")),
+                      SqliteStore(os.path.join(self.home, "db.sqlite"))]:
+            Cache.store = store
+            for key in ["a", "b", "c"]:
+                store.write("users", key, key)
+            self.age("users", "a", 100)
+            self.age("users", "b", 10)
+
+            expired = store.expired_keys("users", 50)
+            self.assertEqual(list(expired), ["a"])
+            self.assertAlmostEqual(expired["a"], time.time() - 100, delta=5)
+            store.close()
+
+    def test_status_aware_expiry(self):
+        """
+        Tests that the expired entries of the cache are determined using
+        the time to live of their airing status
+        :return: None
+        """
+        Cache.ttl_jitter = 0.0
+        self.fake.airing.add(2)
+        cache = Cache()
+        for mal_id in [1, 2, 3]:
+            cache.load_mal_record(mal_id, MediaType.ANIME)
+        self.age("anime", 1, 2 * 86400)
+        self.age("anime", 2, 2 * 86400)
+        Cache.store.write("users", "user", "<myanimelist/>")
+        self.age("users", "user", 2 * 86400)
+
+        self.assertEqual(cache.expired_keys("anime"), {2})
+        self.age("anime", 1, 31 * 86400)
+        self.assertEqual(cache.expired_keys("anime"), {1, 2})
+        self.assertEqual(cache.expired_keys("manga"), set())
+        self.assertEqual(cache.expired_keys("users"), {"user"})
+
+    def test_ttl_by_status(self):
+        """
+        Tests that the time to live depends on the media type and airing
+        status, falling back to the flush time
+        :return: None
+        """
+        Cache.ttl_jitter = 0.0
+        Cache.flush_time = 1000
+        Cache.ttls = {"anime": {AiringState.AIRING.value: 10}}
+        now = time.time()
+
+        self.assertEqual(
+            Cache._ttl("anime", 1, now, AiringState.AIRING.value), 10
+        )
+        self.assertEqual(
+            Cache._ttl("anime", 1, now, AiringState.FINISHED.value), 1000
+        )
+        self.assertEqual(Cache._ttl("anime", 1, now), 1000)
+        self.assertEqual(
+            Cache._ttl("manga", 1, now, AiringState.AIRING.value), 1000
+        )
+        self.assertEqual(Cache._ttl("users", "a", now), 1000)
+
+    def test_ttl_jitter(self):
+        """
+        Tests that the time to live is varied within the configured jitter,
+        stays the same for an entry until it is stored again and differs
+        between entries
+        :return: None
+        """
+        Cache.ttl_jitter = 0.1
+        Cache.flush_time = 1000
+        now = time.time()
+
+        ttls = set()
+        for key in range(100):
+            ttl = Cache._ttl("users", str(key), now)
+            self.assertTrue(900 <= ttl <= 1100)
+            self.assertEqual(ttl, Cache._ttl("users", str(key), now))
+            ttls.add(ttl)
+        self.assertGreater(len(ttls), 90)
+
+        stored_again = [Cache._ttl("users", "0", now + offset)
+                        for offset in range(1, 11)]
+        self.assertGreater(len(set(stored_again)), 1)
+
+    def test_airing_page_refreshed_sooner(self):
+        """
+        Tests that pages of airing anime expire before finished ones
+        :return: None
+        """
+        Cache.ttl_jitter = 0.0
+        self.fake.airing.add(2)
+        cache = Cache()
+        for mal_id in [1, 2]:
+            cache.load_mal_record(mal_id, MediaType.ANIME)
+            self.age("anime", mal_id, 7 * 3600)
+
+        self.assertFalse(Cache._needs_refresh("anime", 1))
+        self.assertTrue(Cache._needs_refresh("anime", 2))
+        self.assertTrue(Cache._needs_refresh("anime", 3))
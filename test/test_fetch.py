@@ -0,0 +1,177 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import time
+import multiprocessing
+from unittest import mock
+from email.utils import formatdate
+from malscraper.Cache import Cache
+from malscraper.RateLimiter import RateLimiter
+from malscraper.Transport import HttpResponse
+from malscraper.exceptions.NotFoundError import NotFoundError
+from malscraper.exceptions.RetryLimitExceededError import \
+    RetryLimitExceededError
+from test.CacheTestCase import CacheTestCase
+
+
+def consume_tokens(state_file: str, amount: int):
+    """
+    Takes tokens from a shared rate limiter in a separate process
+    :param state_file: The state file of the rate limiter
+    :param amount: The amount of tokens to take
+    :return: None
+    """
+    limiter = RateLimiter(rate=1.0, burst=amount, state_file=state_file)
+    for _ in range(amount):
+        limiter.acquire()
+
+
+class FetchTest(CacheTestCase):
+    """
+    Tests fetching pages with retries and rate limiting
+    """
+
+    url = "https://myanimelist.net/anime/1"
+    """
+    The URL fetched by the tests
+    """
+
+    def setUp(self):
+        """
+        Replaces the rate limiter and the sleep function to record
+        the delays without waiting
+        :return: None
+        """
+        super().setUp()
+        Cache.rate_limiter = mock.Mock()
+        Cache.rate_limiter.acquire.return_value = 0.0
+        patcher = mock.patch("malscraper.Cache.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def queue(self, *responses: object):
+        """
+        Queues responses sent before the generated page
+        :param responses: The responses or exceptions to queue
+        :return: None
+        """
+        self.fake.responses[self.url] = list(responses)
+
+    def test_retry_after_seconds(self):
+        """
+        Tests that a Retry-After header in seconds replaces the backoff
+        and pauses the rate limiter
+        :return: None
+        """
+        self.queue(HttpResponse(429, "", {"Retry-After": "2"}))
+        self.assertEqual(Cache._fetch(self.url).status_code, 200)
+        self.sleep.assert_called_once_with(2.0)
+        Cache.rate_limiter.penalize.assert_called_once_with(2.0)
+        self.assertEqual(len(self.fake.requests), 2)
+
+    def test_retry_after_date(self):
+        """
+        Tests that a Retry-After header containing an HTTP date is honoured
+        :return: None
+        """
+        retry_time = formatdate(time.time() + 30, usegmt=True)
+        self.queue(HttpResponse(503, "", {"Retry-After": retry_time}))
+        self.assertEqual(Cache._fetch(self.url).status_code, 200)
+
+        delay = self.sleep.call_args[0][0]
+        self.assertTrue(25 <= delay <= 30)
+        Cache.rate_limiter.penalize.assert_called_once_with(delay)
+
+    def test_invalid_retry_after(self):
+        """
+        Tests that an invalid Retry-After header falls back to the backoff
+        :return: None
+        """
+        Cache.backoff_base = 1.0
+        Cache.backoff_cap = 60.0
+        self.queue(HttpResponse(503, "", {"Retry-After": "soon"}))
+        Cache._fetch(self.url)
+
+        delay = self.sleep.call_args[0][0]
+        self.assertTrue(0 <= delay <= 2)
+        Cache.rate_limiter.penalize.assert_not_called()
+
+    def test_not_found_not_retried(self):
+        """
+        Tests that missing pages are not requested again
+        :return: None
+        """
+        self.fake.missing.add(1)
+        with self.assertRaises(NotFoundError):
+            Cache._fetch(self.url)
+        self.assertEqual(len(self.fake.requests), 1)
+        self.sleep.assert_not_called()
+
+    def test_retry_limit_exceeded(self):
+        """
+        Tests that requests are given up after the configured retries
+        with exponential backoff limited by the cap
+        :return: None
+        """
+        Cache.max_retries = 3
+        Cache.backoff_base = 1.0
+        Cache.backoff_cap = 5.0
+        self.queue(*[HttpResponse(500, "") for _ in range(10)])
+        with self.assertRaises(RetryLimitExceededError):
+            Cache._fetch(self.url)
+
+        self.assertEqual(len(self.fake.requests), 4)
+        delays = [call[0][0] for call in self.sleep.call_args_list]
+        self.assertEqual(len(delays), 3)
+        for attempt, delay in enumerate(delays, 1):
+            self.assertTrue(0 <= delay <= min(5.0, 2 ** attempt))
+
+    def test_connection_errors_retried(self):
+        """
+        Tests that connection errors are retried
+        :return: None
+        """
+        self.queue(IOError("Connection reset"), ConnectionError("Refused"))
+        self.assertEqual(Cache._fetch(self.url).status_code, 200)
+        self.assertEqual(len(self.fake.requests), 3)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_shared_rate_limiter(self):
+        """
+        Tests that rate limiters using the same state file share their
+        bucket across processes
+        :return: None
+        """
+        state_file = os.path.join(self.home, "rate_limit")
+        context = multiprocessing.get_context("spawn")
+        process = context.Process(target=consume_tokens, args=(state_file, 2))
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+
+        limiter = RateLimiter(rate=1.0, burst=2, state_file=state_file)
+        with mock.patch("malscraper.RateLimiter.time.sleep") as sleep:
+            sleep.side_effect = StopIteration
+            with self.assertRaises(StopIteration):
+                limiter.acquire()
+        self.assertTrue(0 < sleep.call_args[0][0] <= 1.0)
+
+        separate = RateLimiter(rate=1.0, burst=2)
+        self.assertEqual(separate.acquire(), 0.0)
@@ -0,0 +1,124 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+from malscraper.Cache import Cache
+from test.CacheTestCase import CacheTestCase
+
+
+class MigrationTest(CacheTestCase):
+    """
+    Tests migrating the legacy layout of the disk cache
+    """
+
+    def setUp(self):
+        """
+        Creates a legacy cache in the temporary home directory
+        :return: None
+        """
+        super().setUp()
+        self.cache_dir = os.path.join(self.home, ".malscraper")
+        for directory in ["anime", "users", "records", "validators"]:
+            os.makedirs(os.path.join(self.cache_dir, directory))
+        self.write_legacy("anime", "1", "<html>1</html>")
+        self.write_legacy("users", "user", "<myanimelist/>")
+        self.write_legacy("records", "1", "{}")
+        self.write_legacy("validators", "1", "{}")
+
+    def write_legacy(self, directory: str, name: str, data: str):
+        """
+        Writes a file of the legacy cache layout
+        :param directory: The directory of the file inside the cache
+        :param name: The name of the file
+        :param data: The content of the file
+        :return: None
+        """
+        with open(os.path.join(self.cache_dir, directory, name), "w") as f:
+            f.write(data)
+
+    def test_migrating_legacy_entries(self):
+        """
+        Tests that legacy entries are moved into the store while
+        unrelated files are kept
+        :return: None
+        """
+        Cache.configure()
+        self.assertEqual(Cache.store.read("anime", 1), "<html>1</html>")
+        self.assertEqual(Cache.store.read("users", "user"), "<myanimelist/>")
+        self.assertFalse(
+            os.path.isfile(os.path.join(self.cache_dir, "anime", "1"))
+        )
+        for directory in ["records", "validators"]:
+            self.assertTrue(
+                os.path.isfile(os.path.join(self.cache_dir, directory, "1"))
+            )
+
+    def test_migrating_shard_names(self):
+        """
+        Tests migrating entries whose names are the same as the names of
+        shard directories, like two-digit IDs or usernames like "ab"
+        :return: None
+        """
+        for mal_id in range(2, 301):
+            self.write_legacy("anime", str(mal_id), str(mal_id))
+        for username in ["ab", "ed", "00"]:
+            self.write_legacy("users", username, username)
+        os.utime(os.path.join(self.cache_dir, "anime", "77"), (1000, 1000))
+
+        Cache.configure()
+        self.assertEqual(Cache().cached_ids("anime"),
+                         set(range(1, 301)))
+        self.assertEqual(Cache.store.read("anime", 77), "77")
+        self.assertEqual(Cache.store.mtime("anime", 77), 1000)
+        for username in ["ab", "ed", "00"]:
+            self.assertEqual(Cache.store.read("users", username), username)
+        self.assertEqual(
+            [x for x in os.listdir(self.cache_dir) if x.endswith(".legacy")],
+            []
+        )
+
+    def test_migrating_once(self):
+        """
+        Tests that the migration does not run again once it completed
+        :return: None
+        """
+        Cache.configure()
+        self.write_legacy("anime", "2", "<html>2</html>")
+        Cache.configure()
+        self.assertIsNone(Cache.store.read("anime", 2))
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.cache_dir, "anime", "2"))
+        )
+
+    def test_configured_root_untouched(self):
+        """
+        Tests that files in a configured cache directory are not migrated
+        :return: None
+        """
+        root = os.path.join(self.home, "legacy")
+        os.rename(self.cache_dir, root)
+        self.cache_dir = root
+        Cache.configure(root=root)
+
+        self.assertIsNone(Cache.store.read("users", "user"))
+        for directory in ["anime", "users", "records", "validators"]:
+            self.assertEqual(
+                os.listdir(os.path.join(self.cache_dir, directory)),
+                ["user" if directory == "users" else "1"]
+            )
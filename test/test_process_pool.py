@@ -0,0 +1,130 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import os
+import pickle
+from malscraper.Cache import Cache, _init_worker
+from malscraper.Transport import SessionTransport, HttpResponse
+from malscraper.types.MediaType import MediaType
+from malscraper.exceptions.FetchError import FetchError
+from malscraper.exceptions.NotFoundError import NotFoundError
+from malscraper.exceptions.RetryLimitExceededError import \
+    RetryLimitExceededError
+from test.CacheTestCase import CacheTestCase
+
+
+class ProcessPoolTest(CacheTestCase):
+    """
+    Tests loading records using a pool of worker processes
+    """
+
+    def test_pickling_fetch_errors(self):
+        """
+        Tests that fetch errors survive being sent between processes
+        :return: None
+        """
+        for error_type in [FetchError, NotFoundError,
+                           RetryLimitExceededError]:
+            error = pickle.loads(pickle.dumps(
+                error_type("https://myanimelist.net/anime/1", 404)
+            ))
+            self.assertIsInstance(error, error_type)
+            self.assertEqual(error.url, "https://myanimelist.net/anime/1")
+            self.assertEqual(error.status_code, 404)
+            self.assertEqual(
+                str(error),
+                "Failed to fetch https://myanimelist.net/anime/1 (404)"
+            )
+
+    def setUp(self):
+        """
+        Configures a cache whose worker processes are started using the
+        spawn method, so they do not inherit any state
+        :return: None
+        """
+        self.settings = self.settings + ["process_start_method"]
+        super().setUp()
+        Cache.process_start_method = "spawn"
+
+    def test_loading_records_in_workers(self):
+        """
+        Tests extracting records using worker processes
+        :return: None
+        """
+        records = Cache().load_mal_records([1, 2, 3], MediaType.ANIME, 2)
+        self.assertEqual(records[2]["name"], "Anime 2")
+        self.assertEqual(Cache().cached_record(3, MediaType.ANIME),
+                         records[3])
+        self.assertEqual(os.listdir(self.home), ["cache"])
+
+    def test_missing_page_in_worker(self):
+        """
+        Tests that a page that does not exist raises a NotFoundError
+        instead of breaking the process pool
+        :return: None
+        """
+        self.fake.missing.add(424242)
+        with self.assertRaises(NotFoundError):
+            Cache().load_mal_records([1, 424242], MediaType.ANIME, 2)
+
+    def test_retry_settings_in_worker(self):
+        """
+        Tests that worker processes use the retry settings of the parent
+        :return: None
+        """
+        Cache.max_retries = 0
+        self.fake.responses["https://myanimelist.net/anime/2"] = \
+            [HttpResponse(503, "")]
+        with self.assertRaises(RetryLimitExceededError):
+            Cache().load_mal_records([2], MediaType.ANIME, 1)
+
+    def test_unpicklable_transport(self):
+        """
+        Tests that a transport that can not be sent to worker processes
+        is rejected
+        :return: None
+        """
+        self.fake.callback = lambda: None
+        with self.assertRaises(TypeError):
+            Cache().load_mal_records([1], MediaType.ANIME, 1)
+
+    def test_worker_configuration(self):
+        """
+        Tests that worker processes apply the configuration of the parent
+        process and do not reuse its connections
+        :return: None
+        """
+        transport = SessionTransport(pool_size=3)
+        transport.session = object()
+        _init_worker(pickle.dumps({
+            "root": self.root, "backend": "sqlite", "compression": None,
+            "transport": transport, "max_retries": 2,
+            "rate_limiter": (1.0, 2, None)
+        }))
+
+        self.assertEqual(Cache.root, self.root)
+        self.assertEqual(Cache.backend, "sqlite")
+        self.assertIsNone(Cache.compression)
+        self.assertEqual(Cache.max_retries, 2)
+        self.assertEqual(Cache.rate_limiter.rate, 1.0)
+        self.assertEqual(Cache.rate_limiter.burst, 2)
+        self.assertIsNone(Cache.store)
+        self.assertFalse(Cache.ready)
+        self.assertEqual(Cache.transport.pool_size, 3)
+        self.assertIsNone(Cache.transport.session)
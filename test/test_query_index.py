@@ -0,0 +1,151 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from typing import Dict, List
+from malscraper.Cache import Cache
+from malscraper.QueryIndex import QueryIndex
+from malscraper.types.MediaType import MediaType
+from malscraper.types.AiringState import AiringState
+from test.CacheTestCase import CacheTestCase
+
+
+def record(name: str, status: AiringState, episodes: int or None,
+           related: List[int] = None) -> Dict[str, object]:
+    """
+    Generates the fields of an anime record
+    :param name: The title of the anime
+    :param status: The airing status
+    :param episodes: The episode count
+    :param related: The IDs of the related anime
+    :return: The fields
+    """
+    return {
+        "name": name,
+        "airing_status": status.value,
+        "episode_count": episodes,
+        "related_anime": related or [],
+        "related_manga": []
+    }
+
+
+class QueryIndexTest(CacheTestCase):
+    """
+    Tests querying the index of the cached records
+    """
+
+    def setUp(self):
+        """
+        Indexes a couple of anime
+        :return: None
+        """
+        super().setUp()
+        self.index = QueryIndex()
+        self.index.add(1, record("Cowboy Bebop", AiringState.FINISHED, 26))
+        self.index.add(2, record("Pokémon: The Movie", AiringState.FINISHED,
+                                 1, [3]))
+        self.index.add(3, record("Pokemon", AiringState.AIRING, None))
+        self.index.add(4, record("Bebop Shorts", AiringState.NOT_YET_AIRED,
+                                 12, [1]))
+
+    def test_search(self):
+        """
+        Tests searching titles, ignoring accents and punctuation
+        :return: None
+        """
+        self.assertEqual(self.index.search("pokemon"), [2, 3])
+        self.assertEqual(self.index.search("POKÉMON movie"), [2])
+        self.assertEqual(self.index.search("beb"), [1, 4])
+        self.assertEqual(self.index.search("bebop cowb"), [1])
+        self.assertEqual(self.index.search("naruto"), [])
+        self.assertEqual(self.index.search("!?"), [])
+
+    def test_range_queries(self):
+        """
+        Tests filtering by episode counts, including the bounds
+        :return: None
+        """
+        self.assertEqual(self.index.query(min_episodes=12), [1, 4])
+        self.assertEqual(self.index.query(max_episodes=12), [2, 4])
+        self.assertEqual(
+            self.index.query(min_episodes=12, max_episodes=12), [4]
+        )
+        self.assertEqual(self.index.query(min_episodes=27), [])
+        self.assertEqual(self.index.query(), [1, 2, 3, 4])
+
+    def test_combined_queries(self):
+        """
+        Tests combining the airing status, relations and titles
+        :return: None
+        """
+        self.assertEqual(
+            self.index.query(airing_status=AiringState.FINISHED), [1, 2]
+        )
+        self.assertEqual(
+            self.index.query(airing_status="Currently Airing"), [3]
+        )
+        self.assertEqual(self.index.query(related_to=1), [4])
+        self.assertEqual(self.index.query(related_to=3), [2])
+        self.assertEqual(self.index.query(
+            title="pokemon", airing_status=AiringState.FINISHED,
+            max_episodes=5
+        ), [2])
+
+    def test_replace_and_remove(self):
+        """
+        Tests that replaced and removed series are no longer found
+        using their previous values
+        :return: None
+        """
+        self.index.add(1, record("Space Cowboy", AiringState.AIRING, 30))
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.search("bebop"), [4])
+        self.assertEqual(self.index.search("space"), [1])
+        self.assertEqual(self.index.query(min_episodes=26), [1])
+        self.assertEqual(
+            self.index.query(airing_status=AiringState.FINISHED), [2]
+        )
+
+        self.index.remove(2)
+        self.index.remove(2)
+        self.assertNotIn(2, self.index)
+        self.assertEqual(self.index.search("movie"), [])
+        self.assertNotIn("movie", self.index.vocabulary)
+        self.assertEqual(self.index.query(related_to=3), [])
+        self.assertEqual(self.index.query(max_episodes=1), [])
+
+    def test_build_and_attach(self):
+        """
+        Tests building the index from the cache and updating it
+        whenever a record is extracted
+        :return: None
+        """
+        cache = Cache()
+        cache.load_mal_record(1, MediaType.ANIME)
+        index = QueryIndex.build()
+        self.addCleanup(index.detach)
+        self.assertEqual(index.search("anime 1"), [1])
+
+        cache.load_mal_record(5, MediaType.ANIME)
+        self.assertEqual(index.query(related_to=6), [5])
+        self.assertEqual(index.query(min_episodes=12, max_episodes=12),
+                         [1, 5])
+
+        index.detach()
+        cache.load_mal_record(7, MediaType.ANIME)
+        self.assertNotIn(7, index)
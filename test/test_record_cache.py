@@ -0,0 +1,66 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from malscraper.Cache import Cache
+from malscraper.types.MediaType import MediaType
+from test.CacheTestCase import CacheTestCase
+from test.FakeTransport import FakeTransport
+
+
+class RecordCacheTest(CacheTestCase):
+    """
+    Tests caching the records extracted from pages
+    """
+
+    def test_page_refreshed_elsewhere(self):
+        """
+        Tests that an expired in-memory record is replaced once its page
+        was refreshed by another process
+        :return: None
+        """
+        cache = Cache()
+        self.assertEqual(cache.load_mal_record(1, MediaType.ANIME)["name"],
+                         "Anime 1")
+        Cache.in_memory["anime_records"].get(1)["timestamp"] -= 10 ** 8
+
+        page = FakeTransport.page_template.format(
+            name="Renamed", sequel=2, status="Finished Airing"
+        )
+        Cache.store.write("anime", 1, page)
+        Cache.store.delete("anime_records", 1)
+
+        for _ in range(2):
+            self.assertEqual(
+                cache.load_mal_record(1, MediaType.ANIME)["name"], "Renamed"
+            )
+        self.assertEqual(len(self.fake.requests), 1)
+
+    def test_preload_builds_index(self):
+        """
+        Tests that preloading without workers indexes the disk cache
+        :return: None
+        """
+        Cache.store.write("anime", 5, "page")
+        Cache.store.write("users", "someone", "list")
+        Cache.disk_index = None
+
+        Cache(preload=True)
+        self.assertEqual(Cache.disk_index["anime"], {5})
+        self.assertEqual(Cache.disk_index["users"], {"someone"})
+        self.assertEqual(len(self.fake.requests), 0)
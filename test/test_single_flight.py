@@ -0,0 +1,125 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+import threading
+from typing import Callable, List
+from concurrent.futures import ThreadPoolExecutor, Future
+from malscraper.Cache import Cache
+from malscraper.SingleFlight import SingleFlight
+from malscraper.types.MediaType import MediaType
+from test.CacheTestCase import CacheTestCase
+
+
+class SingleFlightTest(CacheTestCase):
+    """
+    Tests the de-duplication of concurrent operations
+    """
+
+    def run_concurrently(self, function: Callable[[], object],
+                         amount: int = 8) -> List[Future]:
+        """
+        Executes a function in multiple threads at the same time
+        :param function: The function to execute
+        :param amount: The amount of threads
+        :return: The futures of the executions
+        """
+        barrier = threading.Barrier(amount)
+
+        def run():
+            barrier.wait()
+            return function()
+
+        with ThreadPoolExecutor(max_workers=amount) as executor:
+            return [executor.submit(run) for _ in range(amount)]
+
+    def test_concurrent_calls(self):
+        """
+        Tests that concurrent calls with the same key run only once
+        and share the result
+        :return: None
+        """
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def function():
+            calls.append(1)
+            release.wait(5)
+            return object()
+
+        def start():
+            return flight.run("key", function)
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        futures = self.run_concurrently(start)
+        results = set(id(future.result()) for future in futures)
+        timer.cancel()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(flight.running, {})
+
+    def test_shared_exception(self):
+        """
+        Tests that an exception is raised for every waiting caller and
+        that the key can be used again afterwards
+        :return: None
+        """
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def function():
+            release.wait(5)
+            raise KeyError("key")
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        futures = self.run_concurrently(lambda: flight.run("key", function))
+        for future in futures:
+            self.assertIsInstance(future.exception(), KeyError)
+        self.assertEqual(flight.run("key", lambda: 1), 1)
+
+    def test_interprocess_done(self):
+        """
+        Tests that an operation is skipped if it was completed elsewhere
+        while waiting for the lock file
+        :return: None
+        """
+        flight = SingleFlight(self.home)
+        self.assertIsNone(
+            flight.run("key", lambda: 1, lambda: True, interprocess=True)
+        )
+        self.assertEqual(
+            flight.run("key", lambda: 1, lambda: False, interprocess=True), 1
+        )
+
+    def test_concurrent_page_loads(self):
+        """
+        Tests that concurrent loads of the same page fetch it only once
+        :return: None
+        """
+        self.fake.delay = 0.2
+        futures = self.run_concurrently(
+            lambda: Cache().load_mal_record(1, MediaType.ANIME)
+        )
+        for future in futures:
+            self.assertEqual(future.result()["name"], "Anime 1")
+        self.assertEqual(self.fake.requests,
+                         ["https://myanimelist.net/anime/1"])
@@ -0,0 +1,132 @@
+"""LICENSE
+Copyright 2017 Hermann Krumrey <hermann@krumreyh.com>
+
+This file is part of malscraper.
+
+malscraper is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+malscraper is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with malscraper.  If not, see <http://www.gnu.org/licenses/>.
+LICENSE"""
+
+from typing import Dict, List
+from malscraper.Cache import Cache
+from malscraper.UserAnimeEntry import UserAnimeEntry
+from malscraper.UserListChange import UserListChange
+from malscraper.types.ChangeType import ChangeType
+from test.CacheTestCase import CacheTestCase
+from test.FakeTransport import FakeTransport
+
+
+class UserListSyncTest(CacheTestCase):
+    """
+    Tests synchronizing user lists and the resulting change feed
+    """
+
+    def setUp(self):
+        """
+        Configures a cache and publishes the list of a user
+        :return: None
+        """
+        super().setUp()
+        self.entries = [self.entry(mal_id) for mal_id in range(1, 6)]
+        self.publish()
+
+    @staticmethod
+    def entry(mal_id: int) -> Dict[str, str]:
+        """
+        Generates the XML elements of an entry with empty tags
+        :param mal_id: The ID of the anime
+        :return: The XML elements
+        """
+        return {
+            "series_animedb_id": str(mal_id),
+            "series_title": "Anime " + str(mal_id),
+            "my_watched_episodes": "0",
+            "my_start_date": "0000-00-00",
+            "my_finish_date": "0000-00-00",
+            "my_status": "1",
+            "my_tags": "<![CDATA[]]>" if mal_id % 2 else "<![CDATA[ ]]>"
+        }
+
+    def publish(self):
+        """
+        Makes the current entries available as the user's list
+        :return: None
+        """
+        self.fake.user_lists["user"] = FakeTransport.user_list(self.entries)
+
+    def sync(self) -> List[UserListChange]:
+        """
+        Synchronizes the user's list after the cached list expired
+        :return: The changes
+        """
+        flush_time = Cache.flush_time
+        Cache.flush_time = 0
+        try:
+            return Cache().sync_user_list("user")
+        finally:
+            Cache.flush_time = flush_time
+
+    def test_parsing_blank_tags(self):
+        """
+        Tests that whitespace and blank tags are ignored
+        :return: None
+        """
+        self.assertEqual(UserAnimeEntry.parse_tags(None), [])
+        self.assertEqual(UserAnimeEntry.parse_tags(" "), [])
+        self.assertEqual(UserAnimeEntry.parse_tags(" a, b ,,"), ["a", "b"])
+
+    def test_unchanged_list(self):
+        """
+        Tests that synchronizing an unchanged list reports no changes,
+        regardless of how the previous list was parsed
+        :return: None
+        """
+        Cache().load_user_index("user")
+        self.entries[0]["my_tags"] = "<![CDATA[ ]]>"
+        self.publish()
+        self.assertEqual(self.sync(), [])
+
+    def test_change_feed(self):
+        """
+        Tests that added, removed and updated entries are reported
+        :return: None
+        """
+        Cache().load_user_index("user")
+        self.entries[1]["my_watched_episodes"] = "5"
+        self.entries[2]["my_tags"] = "<![CDATA[new]]>"
+        del self.entries[3]
+        self.entries.append(self.entry(6))
+        self.publish()
+
+        received = []
+        Cache.user_list_listeners.append(
+            lambda username, changes: received.append((username, changes))
+        )
+        try:
+            changes = self.sync()
+        finally:
+            Cache.user_list_listeners.pop()
+
+        self.assertEqual(
+            [(x.change_type, x.mal_id, x.fields) for x in changes],
+            [
+                (ChangeType.UPDATED, 2, ["episodes_watched_count"]),
+                (ChangeType.UPDATED, 3, ["tags"]),
+                (ChangeType.REMOVED, 4, []),
+                (ChangeType.ADDED, 6, [])
+            ]
+        )
+        self.assertEqual(changes[1].new.tags, ["new"])
+        self.assertEqual(received, [("user", changes)])
+        self.assertEqual(Cache().load_user_index("user")[2]
+                         .episodes_watched_count, 5)